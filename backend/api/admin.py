@@ -3,6 +3,7 @@ from django.utils.html import format_html
 from .models import (
     UserProfile,
     Resume,
+    AnalysisJob,
     CareerRecommendation,
     JobOpportunity,
     SavedJob,
@@ -39,6 +40,14 @@ class ResumeAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(AnalysisJob)
+class AnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ('resume', 'user', 'status', 'created_at', 'finished_at')
+    search_fields = ('resume__title', 'user__username')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
+
+
 @admin.register(CareerRecommendation)
 class CareerRecommendationAdmin(admin.ModelAdmin):
     list_display = ('career_title', 'user', 'score_display', 'created_at')
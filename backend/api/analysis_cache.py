@@ -0,0 +1,59 @@
+"""
+Content-addressed cache of resume analysis results.
+
+Uploads are keyed by the SHA-256 of their bytes. Parsed output is also
+keyed by the parser's data files (tech_skills.json, degrees.csv), and
+recommendations by the full pipeline version (model, profile index and
+parser data). Replacing any of those files changes the key, so stale
+results are never served and are evicted from the bounded cache over
+time.
+"""
+import hashlib
+
+from django.core.cache import caches
+
+from ml.pipeline.resume_parser import parse_resume, parser_version
+from ml.pipeline.recommendation_engine import (
+    DEFAULT_POLICY,
+    MIN_SCORE,
+    recommend_careers,
+    pipeline_version,
+)
+
+CACHE_ALIAS = 'analysis'
+
+
+def _version_key(version):
+    return hashlib.sha256(repr(version).encode()).hexdigest()[:16]
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file on disk."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def analyze_resume_file(path, digest=None, top_k=None, min_score=MIN_SCORE, policy=DEFAULT_POLICY):
+    """Return (parsed_resume, recommendations), reusing cached results for identical files."""
+    cache = caches[CACHE_ALIAS]
+    digest = digest or file_digest(path)
+
+    parsed_key = f'resume:parsed:{_version_key(parser_version())}:{digest}'
+    recs_key = f'resume:recs:{_version_key(pipeline_version() + (top_k, min_score, policy))}:{digest}'
+
+    parsed_resume = cache.get(parsed_key)
+    if parsed_resume is None:
+        parsed_resume = parse_resume(path)
+        cache.set(parsed_key, parsed_resume)
+
+    recommendations = cache.get(recs_key)
+    if recommendations is None:
+        recommendations = recommend_careers(
+            parsed_resume, top_k=top_k, min_score=min_score, policy=policy
+        )
+        cache.set(recs_key, recommendations)
+
+    return parsed_resume, recommendations
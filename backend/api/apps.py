@@ -1,5 +1,31 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from ml.models.embedding_model import set_backend, set_micro_batching
+        from .models import CareerRecommendation
+        from .recommendation_cache import recommendation_changed
+
+        post_save.connect(recommendation_changed, sender=CareerRecommendation)
+        post_delete.connect(recommendation_changed, sender=CareerRecommendation)
+
+        set_backend(getattr(settings, 'ML_ENCODER_BACKEND', 'sentence-transformers'))
+        set_micro_batching(
+            getattr(settings, 'ML_ENCODER_MICRO_BATCHING', False),
+            max_batch_size=getattr(settings, 'ML_ENCODER_MAX_BATCH_SIZE', 32),
+            max_wait_ms=getattr(settings, 'ML_ENCODER_MAX_WAIT_MS', 5)
+        )
+
+        # Loading the encoder is opt-in so that migrations and other
+        # management commands never import torch.
+        if getattr(settings, 'ML_WARMUP_ON_STARTUP', False):
+            from ml.models.embedding_model import warm_up
+            from ml.pipeline.profile_index import get_profile_index
+
+            get_profile_index()
+            warm_up()
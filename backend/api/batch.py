@@ -0,0 +1,88 @@
+"""
+Bulk resume analysis shared by the batch endpoint and the
+analyze_resumes management command.
+"""
+import os
+import time
+import zipfile
+
+from django.core.files import File
+
+from ml.pipeline.batch_analyzer import SUPPORTED_EXTENSIONS, analyze_resumes
+
+from .services import persist_resume_analysis
+
+
+def extract_archive(archive, destination, max_files, max_member_bytes):
+    """Unpack supported resumes from a ZIP into destination; returns {path: original name}."""
+    names = {}
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            name = os.path.basename(info.filename)
+            if info.is_dir() or not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                continue
+            if info.file_size > max_member_bytes:
+                raise ValueError(f'{name} exceeds the per-file size limit')
+            if len(names) >= max_files:
+                raise ValueError(f'Archive contains more than {max_files} resumes')
+
+            # Never trust member paths; write flat, numbered files only.
+            path = os.path.join(destination, f'{len(names):05d}_{name}')
+            with zf.open(info) as source, open(path, 'wb') as target:
+                for chunk in iter(lambda: source.read(1024 * 1024), b''):
+                    target.write(chunk)
+            names[path] = info.filename
+    return names
+
+
+def run_batch_analysis(paths, user=None, names=None, workers=None, batch_size=None,
+                       executor=None):
+    """
+    Yield one result dict per resume, then a final summary dict.
+
+    When user is given, each successful result is saved as a Resume with
+    its recommendations (reusing the batch's embedding) and the result
+    carries saved_resume_id. Parsing runs on executor if given, otherwise
+    on a pool of `workers` processes.
+    """
+    names = names or {}
+    options = {'workers': workers, 'executor': executor}
+    if batch_size:
+        options['batch_size'] = batch_size
+
+    started = time.perf_counter()
+    analyzed = failed = 0
+
+    for result in analyze_resumes(paths, **options):
+        path = result['file']
+        result['file'] = names.get(path, os.path.basename(path))
+        embedding = result.pop('embedding', None)
+
+        if 'error' in result:
+            failed += 1
+        else:
+            analyzed += 1
+            if user is not None:
+                with open(path, 'rb') as f:
+                    resume = persist_resume_analysis(
+                        user=user,
+                        resume_file=File(f, name=os.path.basename(result['file'])),
+                        parsed_resume=result['parsed_resume'],
+                        recommendations=result['recommendations'],
+                        embedding=embedding
+                    )
+                result['saved_resume_id'] = resume.id
+
+        yield result
+
+    elapsed = time.perf_counter() - started
+    total = analyzed + failed
+    yield {
+        'summary': {
+            'resumes': total,
+            'analyzed': analyzed,
+            'failed': failed,
+            'seconds': round(elapsed, 3),
+            'resumes_per_second': round(total / elapsed, 2) if elapsed else None
+        }
+    }
@@ -0,0 +1,41 @@
+"""
+Dashboard summaries persisted on Resume.
+
+The resume embedding is stored at analysis time and the summary built
+from it is saved next to it, tagged with the pipeline version (model,
+profile index and parser data). A request only rebuilds the summary when
+that version has changed, and even then reuses the stored embedding, so
+the sentence encoder is not loaded to serve the dashboard.
+"""
+import hashlib
+
+from ml.pipeline.dashboard_builder import build_dashboard_summary
+from ml.pipeline.recommendation_engine import embed_resume, pipeline_version
+from .embeddings import resume_embedding, set_resume_embedding
+
+
+def summary_version():
+    return hashlib.sha256(repr(pipeline_version()).encode()).hexdigest()[:16]
+
+
+def apply_dashboard(resume, parsed_resume, vector=None):
+    """Store the embedding and a fresh dashboard summary on an unsaved Resume."""
+    if vector is None:
+        vector = embed_resume(parsed_resume)
+    set_resume_embedding(resume, vector)
+    resume.dashboard_summary = build_dashboard_summary(parsed_resume, resume_embedding=vector)
+    resume.dashboard_version = summary_version()
+
+
+def get_dashboard_summary(resume, version=None):
+    """Return the persisted summary, rebuilding it if the pipeline changed since."""
+    version = version or summary_version()
+    if resume.dashboard_summary is not None and resume.dashboard_version == version:
+        return resume.dashboard_summary
+
+    apply_dashboard(resume, resume.parsed_content or {}, resume_embedding(resume))
+    # updated_at moves too, so Last-Modified validators see the new summary.
+    resume.save(update_fields=[
+        'embedding', 'embedding_dtype', 'dashboard_summary', 'dashboard_version', 'updated_at'
+    ])
+    return resume.dashboard_summary
@@ -0,0 +1,56 @@
+"""
+Resume embeddings stored as raw bytes on Resume.
+
+Vectors are written in settings.RESUME_EMBEDDING_DTYPE (float16 by
+default, 768 bytes for all-MiniLM-L6-v2) and the type is recorded per
+row, so changing the setting never invalidates stored embeddings.
+"""
+import numpy as np
+from django.conf import settings
+
+from ml.pipeline.recommendation_engine import build_resume_profile
+from ml.models.embedding_model import get_encoder
+
+EMBEDDING_DTYPES = ('float16', 'float32')
+
+
+def storage_dtype():
+    dtype = getattr(settings, 'RESUME_EMBEDDING_DTYPE', 'float16')
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f'RESUME_EMBEDDING_DTYPE must be one of {EMBEDDING_DTYPES}')
+    return dtype
+
+
+def set_resume_embedding(resume, vector):
+    dtype = storage_dtype()
+    resume.embedding = np.asarray(vector, dtype=dtype).tobytes()
+    resume.embedding_dtype = dtype
+
+
+def resume_embedding(resume):
+    """The stored embedding as a float32 array, or None if it was never written."""
+    if not resume.embedding:
+        return None
+    return np.frombuffer(bytes(resume.embedding), dtype=resume.embedding_dtype).astype(np.float32)
+
+
+def embed_resumes(resumes, batch_size=64):
+    """
+    Stored embeddings for resumes as one float32 matrix.
+
+    Resumes without one are encoded from parsed_content in a single batch
+    and the vector is set on the instance (not saved). Returns
+    (matrix, resumes_that_were_encoded).
+    """
+    vectors = [resume_embedding(resume) for resume in resumes]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+    if missing:
+        texts = [build_resume_profile(resumes[i].parsed_content or {}) for i in missing]
+        encoded = np.asarray(get_encoder().encode(texts, batch_size=batch_size), dtype=np.float32)
+        for i, vector in zip(missing, encoded):
+            set_resume_embedding(resumes[i], vector)
+            vectors[i] = vector
+
+    matrix = np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+    return matrix, [resumes[i] for i in missing]
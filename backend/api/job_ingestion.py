@@ -0,0 +1,78 @@
+"""
+Upsert of Adzuna postings into JobOpportunity.
+
+Postings are keyed by their Adzuna id (external_id), so re-ingesting a
+title updates existing rows in place instead of duplicating them. A URL
+already stored under a different id (or on a row created before
+external_id existed) is treated as a duplicate and skipped.
+"""
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import JobOpportunity
+
+BATCH_SIZE = 500
+
+UPDATE_FIELDS = [
+    'title',
+    'company',
+    'location',
+    'description',
+    'salary_min',
+    'salary_max',
+    'url',
+    'posted_date',
+    'source',
+]
+
+
+def deduplicate(postings):
+    """Drop repeated external ids and URLs, keeping the first occurrence."""
+    seen_ids, seen_urls, unique = set(), set(), []
+    for posting in postings:
+        if posting['external_id'] in seen_ids or posting['url'] in seen_urls:
+            continue
+        seen_ids.add(posting['external_id'])
+        seen_urls.add(posting['url'])
+        unique.append(posting)
+    return unique
+
+
+def upsert_postings(postings):
+    """
+    Insert new postings and update known ones in bulk.
+
+    Returns (rows_written, duplicates_skipped).
+    """
+    postings = deduplicate(postings)
+    if not postings:
+        return 0, 0
+
+    # (url, external_id) pairs already stored for these URLs.
+    existing = set()
+    urls = [p['url'] for p in postings]
+    for start in range(0, len(urls), BATCH_SIZE):
+        existing.update(
+            JobOpportunity.objects
+            .filter(url__in=urls[start:start + BATCH_SIZE])
+            .values_list('url', 'external_id')
+        )
+    taken = {url for url, _ in existing}
+
+    now = timezone.now()
+    rows, skipped = [], 0
+    for posting in postings:
+        if posting['url'] in taken and (posting['url'], posting['external_id']) not in existing:
+            skipped += 1
+            continue
+        posted_date = parse_datetime(posting.get('posted_date') or '') or now
+        rows.append(JobOpportunity(**{**posting, 'posted_date': posted_date}))
+
+    JobOpportunity.objects.bulk_create(
+        rows,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['external_id'],
+        update_fields=UPDATE_FIELDS,
+    )
+    return len(rows), skipped
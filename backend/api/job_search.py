@@ -0,0 +1,136 @@
+"""
+Relevance-ranked job search over title, company and location.
+
+Uses the full-text index created in migration 0004: an FTS5 table ranked
+with bm25() on SQLite, a weighted tsvector ranked with ts_rank() on
+PostgreSQL. Every query term must match (as a prefix) in one of the
+searched columns. When the index finds nothing, and on other backends,
+each term is matched as a substring instead (icontains), so partial
+words such as "angal" still find "Bangalore".
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import JobOpportunity
+
+SEARCH_COLUMNS = ('title', 'company', 'location')
+MAX_TERMS = 8
+
+# bm25() column weights on SQLite, in FTS table column order.
+SQLITE_WEIGHTS = {'title': 10.0, 'company': 2.0, 'location': 5.0}
+# setweight() labels assigned by the PostgreSQL trigger.
+POSTGRES_LABELS = {'title': 'A', 'location': 'B', 'company': 'C'}
+
+TERM_RE = re.compile(r'[^\W_]+')
+
+
+def query_terms(query):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+class RankedJobSearch:
+    """
+    Lazily evaluated search results, sliceable like a queryset.
+
+    DRF's paginator only needs count() and slicing, so each page runs one
+    LIMIT/OFFSET query over the full-text index for the ids, then loads
+    those rows in rank order.
+    """
+
+    def __init__(self, terms, columns):
+        self.terms = terms
+        self.columns = columns
+        self.vendor = connection.vendor
+        self._count = None
+
+    def _sql(self):
+        table = JobOpportunity._meta.db_table
+        if self.vendor == 'sqlite':
+            match = ' '.join(f'"{term}"*' for term in self.terms)
+            if set(self.columns) != set(SEARCH_COLUMNS):
+                match = f'{{{" ".join(self.columns)}}} : ({match})'
+            weights = ', '.join(str(SQLITE_WEIGHTS[c]) for c in SEARCH_COLUMNS)
+            source = f'{table}_fts WHERE {table}_fts MATCH %s'
+            order = f'bm25({table}_fts, {weights}), rowid DESC'
+            return source, order, 'rowid', [match]
+
+        labels = ''.join(sorted(POSTGRES_LABELS[c] for c in self.columns))
+        tsquery = ' & '.join(f'{term}:*{labels}' for term in self.terms)
+        source = f"{table} WHERE search_vector @@ to_tsquery('english', %s)"
+        order = "ts_rank(search_vector, to_tsquery('english', %s)) DESC, id DESC"
+        return source, order, 'id', [tsquery, tsquery]
+
+    def count(self):
+        if self._count is None:
+            source, _, _, params = self._sql()
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {source}', params[:1])
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError('RankedJobSearch only supports slicing')
+        offset = key.start or 0
+        limit = -1 if key.stop is None else max(key.stop - offset, 0)
+        if self.vendor != 'sqlite' and limit == -1:
+            limit = None
+
+        source, order, id_column, params = self._sql()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {id_column} FROM {source} ORDER BY {order} LIMIT %s OFFSET %s',
+                params + [limit, offset]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+
+        jobs = JobOpportunity.objects.in_bulk(ids)
+        return [jobs[pk] for pk in ids if pk in jobs]
+
+
+def search_jobs(query, columns=SEARCH_COLUMNS):
+    """Jobs matching every term of query in the given columns, best match first."""
+    terms = query_terms(query)
+    if not terms:
+        return JobOpportunity.objects.all()
+
+    if connection.vendor in ('sqlite', 'postgresql') and has_search_index():
+        ranked = RankedJobSearch(terms, columns)
+        if ranked.count():
+            return ranked
+
+    return substring_search(terms, columns)
+
+
+def substring_search(terms, columns=SEARCH_COLUMNS):
+    """Jobs containing every term as a substring of one of the columns, newest first."""
+    jobs = JobOpportunity.objects.all()
+    for term in terms:
+        match = Q()
+        for column in columns:
+            match |= Q(**{f'{column}__icontains': term})
+        jobs = jobs.filter(match)
+    return jobs
+
+
+_search_index = {}
+
+
+def has_search_index():
+    """Whether migration 0004 created the full-text index (FTS5 may be unavailable)."""
+    alias = connection.alias
+    if alias not in _search_index:
+        table = JobOpportunity._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                names = connection.introspection.table_names(cursor)
+                _search_index[alias] = f'{table}_fts' in names
+            else:
+                columns = connection.introspection.get_table_description(cursor, table)
+                _search_index[alias] = any(c.name == 'search_vector' for c in columns)
+    return _search_index[alias]
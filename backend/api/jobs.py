@@ -0,0 +1,161 @@
+"""
+Background resume analysis.
+
+Jobs are stored as AnalysisJob rows and executed on a local process pool,
+so PDF parsing, OCR, embedding and the Adzuna lookups never run inside a
+request thread. Each worker process sets up Django once and keeps its own
+encoder loaded between jobs.
+
+The pool lives in memory, so jobs it loses (the server restarted before a
+queued job ran, or a worker died mid-job) would stay pending or running.
+A job whose future fails is marked failed as soon as the pool notices;
+anything still pending or running after ANALYSIS_JOB_TIMEOUT seconds is
+stale and is failed (or rerun) by the recover_analysis_jobs command,
+which should run at startup and periodically from cron.
+
+Every server process that submits a job starts its own pool of
+ANALYSIS_WORKERS spawned processes, each with its own copy of the encoder.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from functools import partial
+from threading import Lock
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STALE_JOB_ERROR = 'Job did not finish within ANALYSIS_JOB_TIMEOUT; resubmit the resume'
+
+_executor = None
+_executor_lock = Lock()
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def get_executor():
+    """Return the process-wide worker pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'ANALYSIS_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),),
+            )
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+def enqueue_analysis_job(job):
+    """Hand a saved job to the worker pool once the surrounding transaction commits."""
+    transaction.on_commit(lambda: _submit(job.id))
+
+
+def fail_unfinished_jobs(jobs, error):
+    """Mark the pending or running jobs among `jobs` as failed; returns how many changed."""
+    from .models import AnalysisJob
+
+    return jobs.filter(
+        status__in=(AnalysisJob.STATUS_PENDING, AnalysisJob.STATUS_RUNNING)
+    ).update(
+        status=AnalysisJob.STATUS_FAILED,
+        error=error,
+        finished_at=timezone.now()
+    )
+
+
+def _submit(job_id):
+    from .models import AnalysisJob
+
+    try:
+        future = get_executor().submit(run_analysis_job, job_id)
+    except Exception as e:
+        # A broken pool (e.g. a worker was OOM-killed) is replaced on the next submit.
+        _reset_executor()
+        logger.exception("Could not queue analysis job %s", job_id)
+        fail_unfinished_jobs(AnalysisJob.objects.filter(id=job_id), f'Could not queue job: {e}')
+        return
+    future.add_done_callback(partial(_job_done, job_id))
+
+
+def _job_done(job_id, future):
+    """Fail the job if its future did not complete normally (e.g. the worker died)."""
+    from .models import AnalysisJob
+
+    try:
+        future.result()
+        return
+    except CancelledError:
+        error = 'Job was cancelled'
+    except BrokenProcessPool as e:
+        _reset_executor()
+        error = f'Worker process died: {e}'
+    except Exception as e:
+        error = str(e)
+
+    logger.error("Analysis job %s did not finish: %s", job_id, error)
+    # Usually runs on the pool's management thread, whose connection is
+    # closed again here; left alone if the caller is inside a transaction.
+    try:
+        fail_unfinished_jobs(AnalysisJob.objects.filter(id=job_id), error)
+    finally:
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+def stale_jobs():
+    """Pending or running jobs older than ANALYSIS_JOB_TIMEOUT seconds."""
+    from .models import AnalysisJob
+
+    cutoff = timezone.now() - timedelta(seconds=settings.ANALYSIS_JOB_TIMEOUT)
+    return AnalysisJob.objects.filter(
+        Q(status=AnalysisJob.STATUS_PENDING, created_at__lt=cutoff) |
+        Q(status=AnalysisJob.STATUS_RUNNING, started_at__lt=cutoff)
+    )
+
+
+def run_analysis_job(job_id):
+    """Parse the stored resume, generate recommendations and record the outcome."""
+    from .analysis_cache import analyze_resume_file
+    from .models import AnalysisJob
+    from .services import apply_resume_analysis, save_recommendations
+
+    job = AnalysisJob.objects.select_related('resume', 'user').get(id=job_id)
+    job.status = AnalysisJob.STATUS_RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=['status', 'started_at'])
+
+    try:
+        parsed_resume, recommendations = analyze_resume_file(job.resume.file.path)
+
+        with transaction.atomic():
+            apply_resume_analysis(job.resume, parsed_resume)
+            save_recommendations(job.user, job.resume, recommendations)
+
+        job.status = AnalysisJob.STATUS_COMPLETED
+    except Exception as e:
+        logger.exception("Analysis job %s failed", job_id)
+        job.status = AnalysisJob.STATUS_FAILED
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return job.status
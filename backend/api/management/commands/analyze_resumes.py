@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from ml.pipeline.batch_analyzer import CHUNK_SIZE, ENCODE_BATCH_SIZE, find_resumes
+from api.batch import run_batch_analysis
+
+
+class Command(BaseCommand):
+    help = 'Analyze every PDF/DOCX resume in a directory and write results as JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=str, help='Directory to scan for resumes')
+        parser.add_argument('--output', type=str, default='-',
+                            help='JSONL output file (default: stdout)')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Parser processes (default: CPU count)')
+        parser.add_argument('--batch-size', type=int, default=ENCODE_BATCH_SIZE,
+                            help='Batch size for the sentence encoder')
+        parser.add_argument('--user', type=str, default=None,
+                            help='Also save resumes and recommendations for this username')
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f'{directory} is not a directory')
+
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        paths = find_resumes(directory)
+        self.stderr.write(f'Found {len(paths)} resumes in {directory} (chunks of {CHUNK_SIZE})')
+
+        output = sys.stdout if options['output'] == '-' else open(options['output'], 'w')
+        summary = None
+        try:
+            for result in run_batch_analysis(
+                paths,
+                user=user,
+                names={path: os.path.relpath(path, directory) for path in paths},
+                workers=options['workers'],
+                batch_size=options['batch_size']
+            ):
+                if 'summary' in result:
+                    summary = result['summary']
+                    continue
+                output.write(json.dumps(result) + '\n')
+                output.flush()
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        if summary:
+            self.stderr.write(self.style.SUCCESS(
+                f"Analyzed {summary['analyzed']} resumes ({summary['failed']} failed) "
+                f"in {summary['seconds']}s: {summary['resumes_per_second']} resumes/s"
+            ))
@@ -0,0 +1,47 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from ml.pipeline import adzuna_fetcher
+from api.job_ingestion import upsert_postings
+
+
+class Command(BaseCommand):
+    help = 'Fetch Adzuna postings for every title in career_titles.json and upsert them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('titles', nargs='*',
+                            help='Titles to ingest (default: career_titles.json)')
+        parser.add_argument('--pages', type=int, default=adzuna_fetcher.MAX_PAGES,
+                            help='Result pages to fetch per title')
+        parser.add_argument('--workers', type=int, default=adzuna_fetcher.MAX_WORKERS,
+                            help='Titles fetched concurrently')
+
+    def handle(self, *args, **options):
+        titles = options['titles']
+        if not titles:
+            titles_path = os.path.join(adzuna_fetcher.BASE_DIR, 'data', 'career_titles.json')
+            with open(titles_path) as f:
+                titles = json.load(f)
+
+        started = time.perf_counter()
+        written = skipped = 0
+        for title, postings in adzuna_fetcher.crawl_titles(
+            titles,
+            max_pages=options['pages'],
+            max_workers=options['workers']
+        ):
+            rows, duplicates = upsert_postings(postings)
+            written += rows
+            skipped += duplicates
+            self.stderr.write(f'{title}: {rows} postings ({duplicates} duplicate URLs)')
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Upserted {written} postings for {len(titles)} titles in {elapsed:.1f}s '
+                f'({skipped} duplicate URLs skipped)'
+            )
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from api.jobs import STALE_JOB_ERROR, fail_unfinished_jobs, run_analysis_job, stale_jobs
+from api.models import AnalysisJob
+
+
+class Command(BaseCommand):
+    help = (
+        'Fail or rerun analysis jobs left pending or running past ANALYSIS_JOB_TIMEOUT, '
+        'e.g. after a server restart. Run it on startup or from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requeue', action='store_true',
+                            help='Run stale pending jobs here instead of failing them')
+
+    def handle(self, *args, **options):
+        stale = stale_jobs()
+
+        if options['requeue']:
+            pending = list(
+                stale.filter(status=AnalysisJob.STATUS_PENDING).values_list('id', flat=True)
+            )
+            for job_id in pending:
+                outcome = run_analysis_job(job_id)
+                self.stdout.write(f'Job {job_id}: {outcome}')
+            failed = fail_unfinished_jobs(
+                stale.filter(status=AnalysisJob.STATUS_RUNNING), STALE_JOB_ERROR
+            )
+        else:
+            pending = []
+            failed = fail_unfinished_jobs(stale, STALE_JOB_ERROR)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Reran {len(pending)} and failed {failed} stale jobs')
+        )
@@ -0,0 +1,38 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from ml.pipeline import adzuna_fetcher
+
+
+class Command(BaseCommand):
+    help = 'Warm the Adzuna market cache for every title in career_titles.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=adzuna_fetcher.MAX_WORKERS,
+                            help='Concurrent Adzuna requests')
+        parser.add_argument('--force', action='store_true',
+                            help='Refetch titles that are already cached')
+
+    def handle(self, *args, **options):
+        titles_path = os.path.join(adzuna_fetcher.BASE_DIR, 'data', 'career_titles.json')
+        with open(titles_path) as f:
+            titles = json.load(f)
+
+        started = time.perf_counter()
+        results = adzuna_fetcher.fetch_market_data_batch(
+            titles,
+            max_workers=options['workers'],
+            refresh=options['force']
+        )
+        elapsed = time.perf_counter() - started
+
+        missing = [title for title, data in results.items() if not data.get('job_count')]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Refreshed {len(results)} titles in {elapsed:.1f}s '
+                f'({len(missing)} without job data)'
+            )
+        )
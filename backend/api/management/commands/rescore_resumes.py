@@ -0,0 +1,92 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ml.pipeline.batch_analyzer import CHUNK_SIZE, ENCODE_BATCH_SIZE, score_embeddings
+from ml.pipeline.recommendation_engine import DEFAULT_POLICY, MIN_SCORE, WEIGHT_POLICIES
+from api.embeddings import embed_resumes
+from api.models import CareerRecommendation, Resume
+from api.recommendation_cache import invalidate_top_matches
+from api.services import build_recommendation
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-rank every analyzed resume against the current profile index using '
+        'stored embeddings, replacing its career recommendations'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Resumes scored per matrix product and transaction')
+        parser.add_argument('--batch-size', type=int, default=ENCODE_BATCH_SIZE,
+                            help='Encoder batch size for resumes without a stored embedding')
+        parser.add_argument('--policy', choices=sorted(WEIGHT_POLICIES), default=DEFAULT_POLICY,
+                            help='Score weighting policy')
+        parser.add_argument('--top-k', type=int, default=None,
+                            help='Keep at most this many recommendations per resume')
+        parser.add_argument('--min-score', type=float, default=MIN_SCORE,
+                            help='Drop recommendations scoring at or below this')
+        parser.add_argument('--user', type=str, default=None,
+                            help='Only rescore resumes of this username')
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.filter(parsed_content__isnull=False).select_related('user')
+        if options['user']:
+            try:
+                resumes = resumes.filter(user=User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist")
+
+        started = time.perf_counter()
+        scored = encoded_total = written = 0
+        last_pk = 0
+
+        while True:
+            chunk = list(resumes.filter(pk__gt=last_pk).order_by('pk')[:options['chunk_size']])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+
+            matrix, encoded = embed_resumes(chunk, batch_size=options['batch_size'])
+            recommendations = score_embeddings(
+                [resume.parsed_content for resume in chunk],
+                matrix,
+                top_k=options['top_k'],
+                min_score=options['min_score'],
+                policy=options['policy']
+            )
+            rows = [
+                build_recommendation(resume.user, resume, rec)
+                for resume, recs in zip(chunk, recommendations)
+                for rec in recs
+            ]
+
+            with transaction.atomic():
+                if encoded:
+                    Resume.objects.bulk_update(encoded, ['embedding', 'embedding_dtype'])
+                # Nothing references CareerRecommendation, so a raw delete is
+                # safe. It skips the per-row post_delete signal, which would
+                # queue a cache write for every row.
+                stale = CareerRecommendation.objects.filter(resume__in=chunk)
+                stale._raw_delete(using=stale.db)
+                CareerRecommendation.objects.bulk_create(rows, batch_size=1000)
+                # Neither the delete nor bulk_create sends signals, so the
+                # cache is invalidated here, once per user.
+                for user_id in {resume.user_id for resume in chunk}:
+                    invalidate_top_matches(user_id)
+
+            scored += len(chunk)
+            encoded_total += len(encoded)
+            written += len(rows)
+            self.stderr.write(f'Rescored {scored} resumes')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rescored {scored} resumes in {elapsed:.1f}s: {written} recommendations '
+                f'written, {encoded_total} resumes had no stored embedding and were encoded'
+            )
+        )
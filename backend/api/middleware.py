@@ -0,0 +1,90 @@
+"""
+Request-level hooks for ml.pipeline.tracing.
+
+StageTimingMiddleware times every request as the "request" stage and, with
+ML_STAGE_TIMINGS_HEADER on, reports the per-stage breakdown of that request
+in an X-Stage-Timings header (Server-Timing syntax, durations in ms).
+
+With ML_PROFILE_DIR set, each request is also run under a profiler and the
+result written to that directory: a .prof file for cProfile (read it with
+pstats or snakeviz) or an .html file for pyinstrument (ML_PROFILER).
+"""
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from ml.pipeline.tracing import collect_timings, record
+
+# Requests the hooks leave alone: scrapes and static assets.
+SKIP_PREFIXES = ('/metrics', '/static/', '/media/')
+
+
+def format_timings(timings):
+    return ', '.join(
+        f'{name};dur={seconds * 1000:.1f};desc="{calls} call{"s" if calls != 1 else ""}"'
+        for name, (seconds, calls) in sorted(timings.items(), key=lambda item: -item[1][0])
+    )
+
+
+class StageTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = getattr(settings, 'ML_STAGE_TIMINGS_HEADER', False)
+        self.profile_dir = getattr(settings, 'ML_PROFILE_DIR', '')
+        self.profiler = getattr(settings, 'ML_PROFILER', 'cprofile')
+
+        if self.profile_dir:
+            if self.profiler not in ('cprofile', 'pyinstrument'):
+                raise ImproperlyConfigured("ML_PROFILER must be 'cprofile' or 'pyinstrument'")
+            if self.profiler == 'pyinstrument':
+                try:
+                    import pyinstrument  # noqa: F401
+                except ImportError:
+                    raise ImproperlyConfigured('ML_PROFILER=pyinstrument requires pyinstrument')
+            os.makedirs(self.profile_dir, exist_ok=True)
+
+    def __call__(self, request):
+        if request.path.startswith(SKIP_PREFIXES):
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with collect_timings() as timings:
+            if self.profile_dir:
+                response = self._profiled(request)
+            else:
+                response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+        record('request', elapsed)
+
+        if self.header and timings:
+            response['X-Stage-Timings'] = format_timings(
+                {**timings, 'request': (elapsed, 1)}
+            )
+        return response
+
+    def _profiled(self, request):
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_') or 'root'
+        name = f'{int(time.time() * 1000)}-{os.getpid()}-{request.method}-{slug}'
+
+        if self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+
+            profiler = Profiler()
+            profiler.start()
+            try:
+                return self.get_response(request)
+            finally:
+                profiler.stop()
+                with open(os.path.join(self.profile_dir, name + '.html'), 'w') as f:
+                    f.write(profiler.output_html())
+
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.get_response, request)
+        finally:
+            profiler.dump_stats(os.path.join(self.profile_dir, name + '.prof'))
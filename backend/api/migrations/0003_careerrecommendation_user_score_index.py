@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_analysisjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='careerrecommendation',
+            index=models.Index(fields=['user', '-match_score'], name='api_rec_user_score_idx'),
+        ),
+    ]
@@ -0,0 +1,123 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:52
+
+from django.db import OperationalError, migrations, models
+
+# Full-text index over title, company and location, kept in sync by
+# triggers. SQLite uses an external-content FTS5 table; PostgreSQL a
+# weighted tsvector column with a GIN index. Other backends fall back to
+# icontains lookups (see api.job_search).
+#
+# On SQLite, a later migration that rebuilds api_jobopportunity (most
+# AlterField operations) drops these triggers; re-run the SQL below after it.
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE api_jobopportunity_fts USING fts5("
+    "title, company, location, "
+    "content='api_jobopportunity', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER api_jobopportunity_fts_ai AFTER INSERT ON api_jobopportunity BEGIN "
+    "INSERT INTO api_jobopportunity_fts(rowid, title, company, location) "
+    "VALUES (new.id, new.title, new.company, new.location); END",
+    "CREATE TRIGGER api_jobopportunity_fts_ad AFTER DELETE ON api_jobopportunity BEGIN "
+    "INSERT INTO api_jobopportunity_fts(api_jobopportunity_fts, rowid, title, company, location) "
+    "VALUES ('delete', old.id, old.title, old.company, old.location); END",
+    "CREATE TRIGGER api_jobopportunity_fts_au AFTER UPDATE ON api_jobopportunity BEGIN "
+    "INSERT INTO api_jobopportunity_fts(api_jobopportunity_fts, rowid, title, company, location) "
+    "VALUES ('delete', old.id, old.title, old.company, old.location); "
+    "INSERT INTO api_jobopportunity_fts(rowid, title, company, location) "
+    "VALUES (new.id, new.title, new.company, new.location); END",
+    "INSERT INTO api_jobopportunity_fts(api_jobopportunity_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS api_jobopportunity_fts_ai",
+    "DROP TRIGGER IF EXISTS api_jobopportunity_fts_ad",
+    "DROP TRIGGER IF EXISTS api_jobopportunity_fts_au",
+    "DROP TABLE IF EXISTS api_jobopportunity_fts",
+]
+
+POSTGRES_CREATE = [
+    "ALTER TABLE api_jobopportunity ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION api_jobopportunity_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.company, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE TRIGGER api_jobopportunity_search_vector_update "
+    "BEFORE INSERT OR UPDATE OF title, company, location ON api_jobopportunity "
+    "FOR EACH ROW EXECUTE FUNCTION api_jobopportunity_search_vector()",
+    "UPDATE api_jobopportunity SET title = title",
+    "CREATE INDEX api_jobopportunity_search_idx ON api_jobopportunity USING GIN (search_vector)",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS api_jobopportunity_search_idx",
+    "DROP TRIGGER IF EXISTS api_jobopportunity_search_vector_update ON api_jobopportunity",
+    "DROP FUNCTION IF EXISTS api_jobopportunity_search_vector()",
+    "ALTER TABLE api_jobopportunity DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_statements(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    try:
+        run_statements(schema_editor, {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE})
+    except OperationalError:
+        # SQLite built without FTS5; job search falls back to icontains.
+        if schema_editor.connection.vendor != 'sqlite':
+            raise
+
+
+def drop_search_index(apps, schema_editor):
+    run_statements(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_careerrecommendation_user_score_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobopportunity',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='jobopportunity',
+            name='url',
+            field=models.URLField(max_length=1000),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['-posted_date'], name='api_job_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['title'], name='api_job_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['company'], name='api_job_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['location'], name='api_job_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobopportunity',
+            index=models.Index(fields=['url'], name='api_job_url_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_jobopportunity_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='dashboard_summary',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='dashboard_version',
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 17:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_resume_dashboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='embedding_dtype',
+            field=models.CharField(default='float32', editable=False, max_length=8),
+        ),
+    ]
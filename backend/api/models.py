@@ -32,6 +32,12 @@ class Resume(models.Model):
     skills = models.JSONField(null=True, blank=True)
     experience = models.JSONField(null=True, blank=True)
     education = models.JSONField(null=True, blank=True)
+    # Raw bytes of the resume embedding, written at analysis time; see api.embeddings.
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    embedding_dtype = models.CharField(max_length=8, default='float32', editable=False)
+    dashboard_summary = models.JSONField(null=True, blank=True)
+    # Pipeline version the summary was built with; see api.dashboard.
+    dashboard_version = models.CharField(max_length=16, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,20 +63,55 @@ class CareerRecommendation(models.Model):
 
     class Meta:
         ordering = ['-match_score']
+        indexes = [
+            models.Index(fields=['user', '-match_score'], name='api_rec_user_score_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.career_title} ({self.match_score:.2f})"
 
 
+class AnalysisJob(models.Model):
+    """Track background resume analysis jobs"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='analysis_jobs')
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='analysis_jobs')
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            (STATUS_PENDING, 'Pending'),
+            (STATUS_RUNNING, 'Running'),
+            (STATUS_COMPLETED, 'Completed'),
+            (STATUS_FAILED, 'Failed'),
+        ],
+        default=STATUS_PENDING
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.resume.title} ({self.status})"
+
+
 class JobOpportunity(models.Model):
     """Store job opportunities from Adzuna API"""
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     title = models.CharField(max_length=255)
     company = models.CharField(max_length=255)
     location = models.CharField(max_length=255)
     description = models.TextField()
     salary_min = models.IntegerField(null=True, blank=True)
     salary_max = models.IntegerField(null=True, blank=True)
-    url = models.URLField()
+    url = models.URLField(max_length=1000)
     posted_date = models.DateTimeField()
     source = models.CharField(max_length=100, default='adzuna')
     requirements = models.JSONField(null=True, blank=True)
@@ -78,6 +119,13 @@ class JobOpportunity(models.Model):
 
     class Meta:
         ordering = ['-posted_date']
+        indexes = [
+            models.Index(fields=['-posted_date'], name='api_job_posted_idx'),
+            models.Index(fields=['title'], name='api_job_title_idx'),
+            models.Index(fields=['company'], name='api_job_company_idx'),
+            models.Index(fields=['location'], name='api_job_location_idx'),
+            models.Index(fields=['url'], name='api_job_url_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} at {self.company}"
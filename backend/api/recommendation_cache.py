@@ -0,0 +1,68 @@
+"""
+Per-user cache of /api/recommendations/top_matches/ responses.
+
+Each user has a version number stored in the cache; response keys embed
+it, so bumping the version drops every cached response for that user at
+once. services.save_recommendations bumps it after new rows commit, and
+signal handlers cover rows saved or deleted one at a time.
+
+Versions start at the current time in nanoseconds and count up from
+there. If the cache culls a version key while responses under it are
+still cached, the next version starts from a later clock reading, never
+an old number, so those responses cannot be served again.
+"""
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = 'responses'
+
+
+def _version_key(user_id):
+    return f'top_matches:version:{user_id}'
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def _user_version(cache, user_id):
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, timeout=None):
+            # Another process started the version first; use theirs.
+            version = cache.get(key, version)
+    return version
+
+
+def top_matches_key(user_id, threshold, limit, resume_id):
+    cache = caches[CACHE_ALIAS]
+    version = _user_version(cache, user_id)
+    return f'top_matches:{user_id}:{version}:{threshold}:{limit}:{resume_id or "all"}'
+
+
+def get_top_matches(key):
+    return caches[CACHE_ALIAS].get(key)
+
+
+def set_top_matches(key, payload):
+    caches[CACHE_ALIAS].set(key, payload)
+
+
+def invalidate_top_matches(user_id):
+    """Drop cached top_matches responses for a user once the current transaction commits."""
+    def bump():
+        cache = caches[CACHE_ALIAS]
+        try:
+            cache.incr(_version_key(user_id))
+        except ValueError:
+            cache.set(_version_key(user_id), _new_version(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def recommendation_changed(sender, instance, **kwargs):
+    invalidate_top_matches(instance.user_id)
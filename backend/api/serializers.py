@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from .models import (
     UserProfile,
     Resume,
+    AnalysisJob,
     CareerRecommendation,
     JobOpportunity,
     SavedJob,
@@ -36,6 +37,13 @@ class ResumeSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'user', 'parsed_content', 'skills', 'experience', 'education', 'uploaded_at', 'updated_at')
 
 
+class AnalysisJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AnalysisJob
+        fields = ('id', 'resume', 'status', 'error', 'created_at', 'started_at', 'finished_at')
+        read_only_fields = fields
+
+
 class CareerRecommendationSerializer(serializers.ModelSerializer):
     class Meta:
         model = CareerRecommendation
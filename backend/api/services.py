@@ -0,0 +1,155 @@
+"""
+Persistence of resume analysis results.
+
+Shared by the REST upload endpoint, the legacy /analyze/ view and the
+background job worker so every path writes the same rows the same way.
+"""
+import hashlib
+import logging
+import os
+import time
+
+from django.db import transaction
+
+from ml.pipeline.tracing import stage, traced
+
+from .analysis_cache import analyze_resume_file
+from .dashboard import apply_dashboard
+from .models import Resume, CareerRecommendation
+from .recommendation_cache import invalidate_top_matches
+
+logger = logging.getLogger(__name__)
+
+
+@traced("persist_resume")
+def apply_resume_analysis(resume, parsed_resume, embedding=None):
+    """
+    Copy parsed resume fields, embedding and dashboard summary onto a Resume and save it.
+
+    Pass embedding when the resume was already encoded, to skip encoding it again.
+    """
+    resume.parsed_content = parsed_resume
+    resume.skills = parsed_resume.get("technical_skills", {})
+    resume.experience = {"years": parsed_resume.get("experience_years", 0)}
+    resume.education = {
+        "degree": parsed_resume.get("degree"),
+        "domain": parsed_resume.get("domain")
+    }
+    apply_dashboard(resume, parsed_resume, embedding)
+    resume.save()
+    return resume
+
+
+def build_recommendation(user, resume, rec):
+    """Build an unsaved CareerRecommendation from a recommend_careers result."""
+    average_salary = rec.get("average_salary") or 0
+    salary_text = f"${int(average_salary):,}" if isinstance(average_salary, (int, float)) and average_salary > 0 else ""
+    return CareerRecommendation(
+        user=user,
+        resume=resume,
+        career_title=rec.get("career_title", ""),
+        match_score=rec.get("final_score", 0),
+        description=(
+            f"Semantic: {rec.get('semantic_score', 0)}%, "
+            f"Market: {rec.get('market_score', 0)}%, "
+            f"Open Jobs: {rec.get('job_count', 0)}"
+        ),
+        required_skills=rec.get("missing_skills", []),
+        salary_range=salary_text,
+        job_outlook=f"Market score {rec.get('market_score', 0)}"
+    )
+
+
+@traced("save_recommendations")
+def save_recommendations(user, resume, recommendations):
+    """
+    Insert all recommendations for a resume in one transaction.
+
+    Returns (rows_written, seconds_taken).
+    """
+    rows = [build_recommendation(user, resume, rec) for rec in recommendations]
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        CareerRecommendation.objects.bulk_create(rows)
+        # bulk_create sends no post_save signals.
+        invalidate_top_matches(user.pk)
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        "Saved %d recommendations for resume %s in %.1f ms",
+        len(rows), resume.pk, elapsed * 1000
+    )
+    return len(rows), elapsed
+
+
+def persist_resume_analysis(user, resume_file, parsed_resume, recommendations, title=None,
+                            embedding=None):
+    """Save parsed resume and generated recommendations to DB."""
+    with transaction.atomic():
+        resume = Resume(user=user, title=title or resume_file.name, file=resume_file)
+        apply_resume_analysis(resume, parsed_resume, embedding)
+        save_recommendations(user, resume, recommendations)
+    return resume
+
+
+def default_extension(uploaded_file, extension=".pdf"):
+    """Name an upload without an extension as a PDF, as the parser picks its reader by extension."""
+    if not os.path.splitext(uploaded_file.name or "")[1]:
+        uploaded_file.name = f"{uploaded_file.name or 'resume'}{extension}"
+    return uploaded_file
+
+
+def upload_digest(uploaded_file):
+    """SHA-256 of an uploaded file, read from memory (or Django's spool file)."""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+class AnalysisSaveError(Exception):
+    """The resume was analyzed but its results could not be saved."""
+
+    def __init__(self, error, parsed_resume, recommendations):
+        super().__init__(str(error))
+        self.parsed_resume = parsed_resume
+        self.recommendations = recommendations
+
+
+def discard_resume(resume):
+    resume.file.delete(save=False)
+    resume.delete()
+
+
+def store_and_analyze(user, resume_file, title=None, **options):
+    """
+    Save an upload as a Resume, then analyze the stored file.
+
+    The upload is written to disk once, by the storage backend, and parsed
+    from that path. If analysis fails the Resume and its file are removed
+    and the error is re-raised; if only saving the results fails, they are
+    removed and AnalysisSaveError carries the results.
+    Returns (resume, parsed_resume, recommendations).
+    """
+    default_extension(resume_file)
+    digest = upload_digest(resume_file)
+    with stage("store_upload"):
+        resume = Resume.objects.create(user=user, title=title or resume_file.name, file=resume_file)
+
+    try:
+        parsed_resume, recommendations = analyze_resume_file(resume.file.path, digest, **options)
+    except Exception:
+        discard_resume(resume)
+        raise
+
+    try:
+        with transaction.atomic():
+            apply_resume_analysis(resume, parsed_resume)
+            save_recommendations(user, resume, recommendations)
+    except Exception as e:
+        discard_resume(resume)
+        raise AnalysisSaveError(e, parsed_resume, recommendations) from e
+
+    return resume, parsed_resume, recommendations
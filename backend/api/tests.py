@@ -1,3 +1,573 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .analysis_cache import CACHE_ALIAS as ANALYSIS_CACHE_ALIAS, analyze_resume_file
+from .dashboard import summary_version
+from .job_ingestion import upsert_postings
+from .job_search import RankedJobSearch, has_search_index, search_jobs
+from .jobs import _job_done, run_analysis_job
+from .models import AnalysisJob, CareerRecommendation, JobOpportunity, Resume
+from .recommendation_cache import CACHE_ALIAS, _version_key
+from .services import save_recommendations
+from .views import ranking_options
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix='api-tests-media-')
+
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'tests-{alias}'}
+    for alias in ('default', 'analysis', 'responses')
+}
+
+PARSED_RESUME = {
+    'degree': 'bachelor of technology',
+    'domain': 'technology',
+    'technical_skills': {'programming_languages': ['python']},
+    'experience_years': 3,
+}
+
+
+def recommendation(title, score):
+    return {
+        'career_title': title,
+        'final_score': score,
+        'semantic_score': score,
+        'market_score': 50,
+        'job_count': 10,
+        'average_salary': 100000,
+        'missing_skills': [],
+    }
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CACHES=TEST_CACHES)
+class AuthenticatedTestCase(TestCase):
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.user = User.objects.create_user('alice', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_resume(self, title='cv', **fields):
+        return Resume.objects.create(
+            user=self.user,
+            title=title,
+            file=ContentFile(b'%PDF-1.4', name=f'{title}.pdf'),
+            **fields
+        )
+
+
+class TopMatchesCacheTests(AuthenticatedTestCase):
+    url = '/api/recommendations/top_matches/'
+
+    def setUp(self):
+        super().setUp()
+        self.resume = self.create_resume()
+        with self.captureOnCommitCallbacks(execute=True):
+            save_recommendations(self.user, self.resume, [recommendation('Data Scientist', 80)])
+
+    def titles(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [row['career_title'] for row in response.data['results']]
+
+    def test_repeat_request_is_served_from_cache(self):
+        self.assertEqual(self.titles(), ['Data Scientist'])
+        # A write that sends no signal is not seen until the version changes.
+        CareerRecommendation.objects.update(career_title='Renamed')
+        self.assertEqual(self.titles(), ['Data Scientist'])
+
+    @mock.patch('api.services.apply_dashboard')
+    @mock.patch('api.services.analyze_resume_file')
+    def test_new_upload_invalidates(self, analyze, apply_dashboard):
+        self.assertEqual(self.titles(), ['Data Scientist'])
+        analyze.return_value = (PARSED_RESUME, [recommendation('ML Engineer', 90)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/resumes/upload_and_analyze/',
+                {'file': SimpleUploadedFile('new.pdf', b'%PDF-1.4'), 'title': 'new'},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.titles(), ['ML Engineer', 'Data Scientist'])
+
+    def test_delete_invalidates(self):
+        self.assertEqual(self.titles(), ['Data Scientist'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.resume.delete()
+        self.assertEqual(self.titles(), [])
+
+    def test_culled_version_key_never_revives_old_responses(self):
+        caches[CACHE_ALIAS].clear()
+        self.assertEqual(self.titles(), ['Data Scientist'])
+        with self.captureOnCommitCallbacks(execute=True):
+            save_recommendations(self.user, self.resume, [recommendation('ML Engineer', 90)])
+
+        # The cache culls the version key but keeps the first response.
+        caches[CACHE_ALIAS].delete(_version_key(self.user.pk))
+        self.assertEqual(self.titles(), ['ML Engineer', 'Data Scientist'])
+
+
+class DashboardTests(AuthenticatedTestCase):
+    url = '/api/dashboard/'
+
+    def setUp(self):
+        super().setUp()
+        self.resume = self.create_resume(
+            parsed_content=PARSED_RESUME,
+            dashboard_summary={'skills': ['python']},
+            dashboard_version=summary_version()
+        )
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary'], {'skills': ['python']})
+        self.assertIn('private', response['Cache-Control'])
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_etag_changes_when_resume_changes(self):
+        etag = self.client.get(self.url)['ETag']
+        self.resume.title = 'renamed'
+        self.resume.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_pipeline_change_defeats_if_modified_since(self):
+        Resume.objects.filter(pk=self.resume.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        last_modified = self.client.get(self.url)['Last-Modified']
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304
+        )
+
+        with mock.patch('api.views.summary_version', return_value='new-version'), \
+                mock.patch('api.dashboard.summary_version', return_value='new-version'), \
+                mock.patch('api.dashboard.build_dashboard_summary', return_value={'skills': ['sql']}), \
+                mock.patch('api.dashboard.resume_embedding', return_value=[0.0, 1.0]), \
+                mock.patch('api.dashboard.set_resume_embedding'):
+            response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['summary'], {'skills': ['sql']})
+        self.assertNotEqual(response['Last-Modified'], last_modified)
+
+
+class JobSearchIndexTests(TestCase):
+    def setUp(self):
+        if not has_search_index():
+            self.skipTest('database has no full-text index (e.g. SQLite without FTS5)')
+        self.job = JobOpportunity.objects.create(
+            title='Python Developer',
+            company='Acme',
+            location='Bangalore',
+            description='',
+            url='https://example.com/jobs/1',
+            posted_date=timezone.now()
+        )
+
+    def ranked_ids(self, query, columns=('title', 'company', 'location')):
+        results = search_jobs(query, columns)
+        if not isinstance(results, RankedJobSearch):
+            return []
+        return [job.id for job in results[0:10]]
+
+    def test_index_follows_updates(self):
+        self.assertEqual(self.ranked_ids('python'), [self.job.id])
+
+        self.job.title = 'Rust Developer'
+        self.job.save()
+        self.assertEqual(self.ranked_ids('python'), [])
+        self.assertEqual(self.ranked_ids('rust'), [self.job.id])
+
+    def test_index_follows_deletes(self):
+        self.job.delete()
+        self.assertEqual(self.ranked_ids('python'), [])
+
+    def test_substring_fallback(self):
+        self.assertEqual([job.id for job in search_jobs('angal', ['location'])], [self.job.id])
+
+
+class UpsertPostingsTests(TestCase):
+    def posting(self, external_id, url, title='Data Analyst'):
+        return {
+            'external_id': external_id,
+            'title': title,
+            'company': 'Acme',
+            'location': 'Pune',
+            'description': '',
+            'salary_min': None,
+            'salary_max': None,
+            'url': url,
+            'posted_date': '2026-01-01T00:00:00Z',
+            'source': 'adzuna',
+        }
+
+    def test_updates_existing_rows_by_external_id(self):
+        self.assertEqual(upsert_postings([self.posting('1', 'https://example.com/1')]), (1, 0))
+        written = upsert_postings([self.posting('1', 'https://example.com/1', title='Senior Data Analyst')])
+
+        self.assertEqual(written, (1, 0))
+        self.assertEqual(JobOpportunity.objects.count(), 1)
+        self.assertEqual(JobOpportunity.objects.get().title, 'Senior Data Analyst')
+
+    def test_skips_duplicates(self):
+        upsert_postings([self.posting('1', 'https://example.com/1')])
+        written = upsert_postings([
+            self.posting('2', 'https://example.com/1'),  # URL stored under another id
+            self.posting('3', 'https://example.com/3'),
+            self.posting('3', 'https://example.com/3'),  # repeated in the batch
+        ])
+
+        self.assertEqual(written, (1, 1))
+        self.assertEqual(
+            sorted(JobOpportunity.objects.values_list('external_id', flat=True)), ['1', '3']
+        )
+
+    def test_update_reaches_search_index(self):
+        if not has_search_index():
+            self.skipTest('database has no full-text index')
+        upsert_postings([self.posting('1', 'https://example.com/1')])
+        upsert_postings([self.posting('1', 'https://example.com/1', title='Statistician')])
+
+        self.assertIsInstance(search_jobs('statistician', ['title']), RankedJobSearch)
+
+
+class RescoreResumesTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resumes = [self.create_resume(f'cv{i}', parsed_content=PARSED_RESUME) for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            for resume in self.resumes:
+                save_recommendations(self.user, resume, [
+                    recommendation('Data Scientist', 80), recommendation('Analyst', 60)
+                ])
+
+    @mock.patch('api.management.commands.rescore_resumes.embed_resumes')
+    @mock.patch('api.management.commands.rescore_resumes.score_embeddings')
+    def test_replaces_rows_and_invalidates_once_per_user(self, score_embeddings, embed_resumes):
+        embed_resumes.side_effect = lambda chunk, batch_size: (None, [])
+        score_embeddings.side_effect = lambda parsed, matrix, **kwargs: [
+            [recommendation('ML Engineer', 90)] for _ in parsed
+        ]
+
+        with mock.patch('api.recommendation_cache.transaction.on_commit') as on_commit:
+            call_command('rescore_resumes', stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual(
+            list(CareerRecommendation.objects.values_list('career_title', flat=True).distinct()),
+            ['ML Engineer']
+        )
+        self.assertEqual(CareerRecommendation.objects.count(), 3)
+        self.assertEqual(on_commit.call_count, 1)
+
+
+@override_settings(CACHES=TEST_CACHES)
+@mock.patch('api.analysis_cache.recommend_careers')
+@mock.patch('api.analysis_cache.parse_resume')
+class AnalysisCacheTests(TestCase):
+    def setUp(self):
+        caches[ANALYSIS_CACHE_ALIAS].clear()
+        with tempfile.NamedTemporaryFile(suffix='.pdf', dir=MEDIA_ROOT, delete=False) as f:
+            f.write(b'%PDF-1.4 resume')
+        self.path = f.name
+        self.addCleanup(os.remove, self.path)
+
+    def analyze(self, parse, recommend, **kwargs):
+        parse.return_value = PARSED_RESUME
+        recommend.return_value = [recommendation('Data Scientist', 80)]
+        return analyze_resume_file(self.path, **kwargs)
+
+    def test_identical_file_is_analyzed_once(self, parse, recommend):
+        first = self.analyze(parse, recommend)
+        self.assertEqual(self.analyze(parse, recommend), first)
+        self.assertEqual((parse.call_count, recommend.call_count), (1, 1))
+
+    def test_parser_change_invalidates_both(self, parse, recommend):
+        self.analyze(parse, recommend)
+        with mock.patch('api.analysis_cache.parser_version', return_value=('changed',)), \
+                mock.patch('api.analysis_cache.pipeline_version', return_value=('changed',)):
+            self.analyze(parse, recommend)
+        self.assertEqual((parse.call_count, recommend.call_count), (2, 2))
+
+    def test_pipeline_change_keeps_parsed_resume(self, parse, recommend):
+        self.analyze(parse, recommend)
+        with mock.patch('api.analysis_cache.pipeline_version', return_value=('changed',)):
+            self.analyze(parse, recommend)
+        self.assertEqual((parse.call_count, recommend.call_count), (1, 2))
+
+    def test_options_are_part_of_the_key(self, parse, recommend):
+        self.analyze(parse, recommend)
+        self.analyze(parse, recommend, top_k=3)
+        self.analyze(parse, recommend, min_score=90)
+        self.assertEqual((parse.call_count, recommend.call_count), (1, 3))
+
+    def test_different_content_is_a_miss(self, parse, recommend):
+        self.analyze(parse, recommend)
+        with open(self.path, 'ab') as f:
+            f.write(b' edited')
+        self.analyze(parse, recommend)
+        self.assertEqual((parse.call_count, recommend.call_count), (2, 2))
+
+
+@override_settings(RESUME_UPLOAD_MAX_BYTES=1024)
+class UploadLimitTests(AuthenticatedTestCase):
+    def post(self, url, field, size):
+        return self.client.post(
+            url, {field: SimpleUploadedFile('cv.pdf', b'x' * size)}, format='multipart'
+        )
+
+    @mock.patch('api.views.store_and_analyze')
+    @mock.patch('api.views.create_analysis_job')
+    def test_oversized_uploads_are_rejected(self, create_analysis_job, store_and_analyze):
+        for url, field in (
+            ('/api/resumes/upload_and_analyze/', 'file'),
+            ('/api/resumes/submit/', 'file'),
+            ('/analyze/', 'resume'),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.post(url, field, 2048).status_code, 413)
+        store_and_analyze.assert_not_called()
+        create_analysis_job.assert_not_called()
+        self.assertFalse(Resume.objects.exists())
+
+    @mock.patch('api.views.create_analysis_job')
+    def test_uploads_within_the_limit_are_accepted(self, create_analysis_job):
+        create_analysis_job.return_value = AnalysisJob(id=1, user=self.user)
+        self.assertEqual(self.post('/api/resumes/submit/', 'file', 512).status_code, 202)
+
+
+@mock.patch('api.services.apply_dashboard')
+@mock.patch('api.services.analyze_resume_file')
+class LegacyAnalyzeTests(AuthenticatedTestCase):
+    url = '/analyze/'
+
+    def post(self):
+        return self.client.post(
+            self.url,
+            {'resume': SimpleUploadedFile('cv', b'%PDF-1.4'), 'username': self.user.username},
+            format='multipart'
+        )
+
+    def test_returns_and_saves_the_analysis(self, analyze, apply_dashboard):
+        analyze.return_value = (PARSED_RESUME, [recommendation('Data Scientist', 80)])
+        response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        resume = Resume.objects.get(id=data['saved_resume_id'])
+        self.assertTrue(resume.file.name.endswith('.pdf'))
+        self.assertEqual(data['recommendations'][0]['career_title'], 'Data Scientist')
+
+    @mock.patch('api.services.save_recommendations', side_effect=RuntimeError('database is locked'))
+    def test_save_failure_still_returns_the_analysis(self, save_recommendations, analyze, apply_dashboard):
+        analyze.return_value = (PARSED_RESUME, [recommendation('Data Scientist', 80)])
+        response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['save_error'], 'database is locked')
+        self.assertEqual(data['parsed_resume'], PARSED_RESUME)
+        self.assertNotIn('saved_resume_id', data)
+        self.assertFalse(Resume.objects.exists())
+
+    def test_analysis_failure_is_an_error(self, analyze, apply_dashboard):
+        analyze.side_effect = ValueError('unreadable pdf')
+        response = self.post()
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'unreadable pdf'})
+        self.assertFalse(Resume.objects.exists())
+
+
+@override_settings(DEBUG=False, METRICS_PUBLIC=False, METRICS_TOKEN='s3cret',
+                   METRICS_ALLOWED_IPS=['10.0.0.5'])
+class MetricsAccessTests(SimpleTestCase):
+    url = '/metrics'
+
+    def status(self, **extra):
+        return self.client.get(self.url, REMOTE_ADDR='203.0.113.9', **extra).status_code
+
+    def test_closed_by_default(self):
+        self.assertEqual(self.status(), 403)
+        self.assertEqual(self.status(HTTP_AUTHORIZATION='Bearer wrong'), 403)
+
+    def test_allowed_address(self):
+        self.assertEqual(self.client.get(self.url, REMOTE_ADDR='10.0.0.5').status_code, 200)
+
+    def test_bearer_token(self):
+        self.assertEqual(self.status(HTTP_AUTHORIZATION='Bearer s3cret'), 200)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_empty_token_never_matches(self):
+        self.assertEqual(self.status(HTTP_AUTHORIZATION='Bearer '), 403)
+
+    def test_public_or_debug(self):
+        for overrides in ({'METRICS_PUBLIC': True}, {'DEBUG': True}):
+            with self.subTest(**overrides), override_settings(**overrides):
+                response = self.client.get(self.url, REMOTE_ADDR='203.0.113.9')
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+
+class RankingOptionsTests(SimpleTestCase):
+    def test_parses_options(self):
+        self.assertEqual(
+            ranking_options({'top_k': '3', 'min_score': '42.5', 'policy': 'semantic_only'}),
+            {'top_k': 3, 'min_score': 42.5, 'policy': 'semantic_only'}
+        )
+        self.assertEqual(ranking_options({'top_k': '', 'min_score': ''}), {})
+
+    def test_rejects_invalid_values(self):
+        for data in (
+            {'top_k': '0'}, {'top_k': 'many'},
+            {'min_score': 'nan'}, {'min_score': 'inf'}, {'min_score': '-Infinity'}, {'min_score': 'high'},
+            {'policy': 'random'},
+        ):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                ranking_options(data)
+
+
+class BatchAnalyzeTests(AuthenticatedTestCase):
+    url = '/api/resumes/batch_analyze/'
+
+    def post(self, *files):
+        return self.client.post(
+            self.url,
+            {'files': [SimpleUploadedFile(name, content) for name, content in files]},
+            format='multipart'
+        )
+
+    @override_settings(BATCH_ANALYSIS_MAX_BYTES=1024)
+    @mock.patch('api.views.run_batch_analysis')
+    def test_rejects_oversized_body_before_parsing(self, run_batch_analysis):
+        response = self.post(('a.pdf', b'x' * 600), ('b.pdf', b'x' * 600))
+        self.assertEqual(response.status_code, 413)
+        run_batch_analysis.assert_not_called()
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    @mock.patch('api.views.run_batch_analysis')
+    def test_spooled_uploads_reach_the_analyzer(self, run_batch_analysis):
+        seen = {}
+
+        def analyze(paths, names, **kwargs):
+            for path in paths:
+                with open(path, 'rb') as f:
+                    seen[names[path]] = f.read()
+            yield {'summary': {'resumes': len(paths)}}
+
+        run_batch_analysis.side_effect = analyze
+        response = self.post(('a.pdf', b'first'), ('b.docx', b'second'))
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+        self.assertEqual(lines, [{'summary': {'resumes': 2}}])
+        self.assertEqual(seen, {'a.pdf': b'first', 'b.docx': b'second'})
+
+
+@mock.patch('api.services.apply_dashboard')
+class AnalysisJobTests(AuthenticatedTestCase):
+    def submit(self):
+        response = self.client.post(
+            '/api/resumes/submit/',
+            {'file': SimpleUploadedFile('cv.pdf', b'%PDF-1.4')},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, 202)
+        return response.data['id'], response['Location']
+
+    def poll(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_lifecycle(self, apply_dashboard):
+        job_id, status_url = self.submit()
+        self.assertEqual(self.poll(status_url)['status'], AnalysisJob.STATUS_PENDING)
+
+        with mock.patch('api.analysis_cache.analyze_resume_file') as analyze:
+            analyze.return_value = (PARSED_RESUME, [recommendation('Data Scientist', 80)])
+            run_analysis_job(job_id)
+
+        job = self.poll(status_url)
+        self.assertEqual(job['status'], AnalysisJob.STATUS_COMPLETED)
+        self.assertIsNotNone(job['finished_at'])
+        self.assertEqual(CareerRecommendation.objects.filter(user=self.user).count(), 1)
+
+    def test_analysis_error_fails_job(self, apply_dashboard):
+        job_id, status_url = self.submit()
+        with mock.patch('api.analysis_cache.analyze_resume_file', side_effect=ValueError('bad pdf')):
+            run_analysis_job(job_id)
+
+        job = self.poll(status_url)
+        self.assertEqual(job['status'], AnalysisJob.STATUS_FAILED)
+        self.assertEqual(job['error'], 'bad pdf')
+
+    def test_dead_worker_fails_job(self, apply_dashboard):
+        job_id, status_url = self.submit()
+        future = Future()
+        future.set_exception(RuntimeError('worker exited'))
+        _job_done(job_id, future)
+
+        job = self.poll(status_url)
+        self.assertEqual(job['status'], AnalysisJob.STATUS_FAILED)
+        self.assertEqual(job['error'], 'worker exited')
+
+    @override_settings(ANALYSIS_JOB_TIMEOUT=60)
+    def test_recovery_fails_stale_jobs(self, apply_dashboard):
+        stale_id, stale_url = self.submit()
+        fresh_id, fresh_url = self.submit()
+        AnalysisJob.objects.filter(id=stale_id).update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        # Polling only reads.
+        self.assertEqual(self.poll(stale_url)['status'], AnalysisJob.STATUS_PENDING)
+
+        call_command('recover_analysis_jobs', stdout=StringIO())
+        job = self.poll(stale_url)
+        self.assertEqual(job['status'], AnalysisJob.STATUS_FAILED)
+        self.assertIn('ANALYSIS_JOB_TIMEOUT', job['error'])
+        self.assertEqual(self.poll(fresh_url)['status'], AnalysisJob.STATUS_PENDING)
+
+    @override_settings(ANALYSIS_JOB_TIMEOUT=60)
+    def test_recovery_requeues_stale_pending_jobs(self, apply_dashboard):
+        job_id, status_url = self.submit()
+        AnalysisJob.objects.filter(id=job_id).update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        with mock.patch('api.analysis_cache.analyze_resume_file') as analyze:
+            analyze.return_value = (PARSED_RESUME, [recommendation('Data Scientist', 80)])
+            call_command('recover_analysis_jobs', '--requeue', stdout=StringIO())
+
+        self.assertEqual(self.poll(status_url)['status'], AnalysisJob.STATUS_COMPLETED)
+
+    def test_other_users_cannot_poll(self, apply_dashboard):
+        _, status_url = self.submit()
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user('bob'))
+        self.assertEqual(other.get(status_url).status_code, 404)
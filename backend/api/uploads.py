@@ -0,0 +1,19 @@
+"""
+Upload size enforcement for the resume upload endpoints.
+
+Django reads at most Content-Length bytes of a request body and ignores
+multipart bodies sent without one, so the declared length bounds what an
+upload can cost. It is checked before anything reads the body.
+"""
+
+
+def declared_length(request):
+    try:
+        return int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return 0
+
+
+def upload_exceeds(request, max_bytes):
+    """Whether the request body is declared larger than max_bytes; never reads the body."""
+    return declared_length(request) > max_bytes
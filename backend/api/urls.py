@@ -4,6 +4,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     # Page views
     analyze_resume,
+    metrics,
     chatbot_page,
     dashboard_page,
     index_page,
@@ -16,6 +17,7 @@ from .views import (
     UserProfileViewSet,
     ResumeViewSet,
     CareerRecommendationViewSet,
+    DashboardViewSet,
     JobOpportunityViewSet,
     SavedJobViewSet,
     ChatMessageViewSet,
@@ -26,6 +28,7 @@ router = DefaultRouter()
 router.register(r'profiles', UserProfileViewSet, basename='profile')
 router.register(r'resumes', ResumeViewSet, basename='resume')
 router.register(r'recommendations', CareerRecommendationViewSet, basename='recommendation')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
 router.register(r'jobs', JobOpportunityViewSet, basename='job')
 router.register(r'saved-jobs', SavedJobViewSet, basename='saved-job')
 router.register(r'messages', ChatMessageViewSet, basename='message')
@@ -47,6 +50,8 @@ urlpatterns = [
     path("profile", profile_page),
     path("login", login_page),
     path("register", register_page),
+    # Prometheus scrape target
+    path("metrics", metrics, name="metrics"),
     # Legacy endpoint
     path("analyze/", analyze_resume, name="analyze_resume"),
     # Support old/static .html links used in templates
@@ -1,21 +1,40 @@
+import hashlib
+import hmac
+import json
+import math
 import os
+import shutil
 import tempfile
-from django.http import JsonResponse
+import zipfile
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.shortcuts import render
 from django.contrib.auth.models import User
+from django.core.files.move import file_move_safe
+from django.db import transaction
+from django.db.models import Count, Window
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
-from ml.pipeline.resume_parser import parse_resume
-from ml.pipeline.recommendation_engine import recommend_careers
-
+from ml.models.embedding_model import render_service_metrics
+from ml.pipeline.recommendation_engine import WEIGHT_POLICIES
+from ml.pipeline.tracing import render_prometheus
+from .recommendation_cache import get_top_matches, set_top_matches, top_matches_key
+from .batch import extract_archive, run_batch_analysis
+from .dashboard import get_dashboard_summary, summary_version
+from .jobs import enqueue_analysis_job, get_executor
+from .job_search import SEARCH_COLUMNS, search_jobs
 from .models import (
     UserProfile,
     Resume,
+    AnalysisJob,
     CareerRecommendation,
     JobOpportunity,
     SavedJob,
@@ -24,11 +43,14 @@ from .models import (
 from .serializers import (
     UserProfileSerializer,
     ResumeSerializer,
+    AnalysisJobSerializer,
     CareerRecommendationSerializer,
     JobOpportunitySerializer,
     SavedJobSerializer,
     ChatMessageSerializer,
 )
+from .services import AnalysisSaveError, default_extension, store_and_analyze
+from .uploads import upload_exceeds
 
 
 #Frontend Pages
@@ -97,40 +119,48 @@ def resolve_user_for_analysis(request):
     return user
 
 
-def persist_resume_analysis(user, resume_file, parsed_resume, recommendations):
-    """Save parsed resume and generated recommendations to DB."""
-    resume = Resume.objects.create(
-        user=user,
-        title=resume_file.name,
-        file=resume_file,
-        parsed_content=parsed_resume,
-        skills=parsed_resume.get("technical_skills", {}),
-        experience={"years": parsed_resume.get("experience_years", 0)},
-        education={
-            "degree": parsed_resume.get("degree"),
-            "domain": parsed_resume.get("domain")
-        }
-    )
+def ranking_options(data):
+    """Read optional top_k / min_score / policy ranking parameters from request data."""
+    options = {}
+    if data.get('top_k') not in (None, ''):
+        try:
+            options['top_k'] = int(data['top_k'])
+        except ValueError:
+            options['top_k'] = 0
+        if options['top_k'] < 1:
+            raise ValueError('top_k must be a positive integer')
+    if data.get('min_score') not in (None, ''):
+        try:
+            min_score = float(data['min_score'])
+        except ValueError:
+            min_score = math.nan
+        if not math.isfinite(min_score):
+            raise ValueError('min_score must be a finite number')
+        options['min_score'] = min_score
+    if data.get('policy') not in (None, ''):
+        if data['policy'] not in WEIGHT_POLICIES:
+            raise ValueError(f"policy must be one of: {', '.join(WEIGHT_POLICIES)}")
+        options['policy'] = data['policy']
+    return options
 
-    for rec in recommendations:
-        average_salary = rec.get("average_salary") or 0
-        salary_text = f"${int(average_salary):,}" if isinstance(average_salary, (int, float)) and average_salary > 0 else ""
-        CareerRecommendation.objects.create(
-            user=user,
-            resume=resume,
-            career_title=rec.get("career_title", ""),
-            match_score=rec.get("final_score", 0),
-            description=(
-                f"Semantic: {rec.get('semantic_score', 0)}%, "
-                f"Market: {rec.get('market_score', 0)}%, "
-                f"Open Jobs: {rec.get('job_count', 0)}"
-            ),
-            required_skills=rec.get("missing_skills", []),
-            salary_range=salary_text,
-            job_outlook=f"Market score {rec.get('market_score', 0)}"
-        )
 
-    return resume
+def upload_too_large(request):
+    """Whether the upload exceeds RESUME_UPLOAD_MAX_BYTES; see api.uploads.upload_exceeds."""
+    return upload_exceeds(request, settings.RESUME_UPLOAD_MAX_BYTES)
+
+
+def upload_too_large_message():
+    return f'Upload exceeds the {settings.RESUME_UPLOAD_MAX_BYTES} byte limit'
+
+
+def create_analysis_job(user, resume_file, title):
+    """Store the upload and queue it for background analysis."""
+    default_extension(resume_file)
+    with transaction.atomic():
+        resume = Resume.objects.create(user=user, title=title, file=resume_file)
+        job = AnalysisJob.objects.create(user=user, resume=resume)
+        enqueue_analysis_job(job)
+    return job
 
 
 # ==================== ViewSets for REST API ====================
@@ -183,73 +213,136 @@ class ResumeViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def upload_and_analyze(self, request):
         """Upload resume and automatically parse it"""
+        if upload_too_large(request):
+            return Response(
+                {'error': upload_too_large_message()},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
         if 'file' not in request.FILES:
             return Response(
                 {'error': 'No resume file provided'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        try:
+            options = ranking_options(request.data)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         resume_file = request.FILES['file']
         title = request.data.get('title', resume_file.name)
-        _, extension = os.path.splitext(resume_file.name or "")
-        suffix = extension.lower() if extension else ".pdf"
-        temp_path = None
-
-        # Save file temporarily using a unique path to avoid collisions.
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as destination:
-            temp_path = destination.name
-            for chunk in resume_file.chunks():
-                destination.write(chunk)
 
         try:
-            # Parse resume
-            parsed_resume = parse_resume(temp_path)
-            recommendations = recommend_careers(parsed_resume)
+            resume, _, _ = store_and_analyze(request.user, resume_file, title, **options)
+        except Exception as e:
+            return Response(
+                {'error': f'Resume analysis failed: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-            # Create resume record
-            resume = Resume.objects.create(
-                user=request.user,
-                title=title,
-                file=resume_file,
-                parsed_content=parsed_resume,
-                skills=parsed_resume.get('technical_skills', {}),
-                experience={'years': parsed_resume.get('experience_years', 0)},
-                education={
-                    'degree': parsed_resume.get('degree'),
-                    'domain': parsed_resume.get('domain')
-                }
+        serializer = self.get_serializer(resume)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def batch_analyze(self, request):
+        """Analyze many resumes (a ZIP 'archive' and/or several 'files'), streaming JSONL results"""
+        max_bytes = settings.BATCH_ANALYSIS_MAX_BYTES
+        if upload_exceeds(request, max_bytes):
+            return Response(
+                {'error': f'Upload exceeds the {max_bytes} byte limit'},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
             )
 
-            # Save recommendations
-            for rec in recommendations:
-                average_salary = rec.get('average_salary') or 0
-                salary_text = f"${int(average_salary):,}" if isinstance(average_salary, (int, float)) and average_salary > 0 else ""
-                CareerRecommendation.objects.create(
-                    user=request.user,
-                    resume=resume,
-                    career_title=rec.get('career_title', ''),
-                    match_score=rec.get('final_score', 0),
-                    description=(
-                        f"Semantic: {rec.get('semantic_score', 0)}%, "
-                        f"Market: {rec.get('market_score', 0)}%, "
-                        f"Open Jobs: {rec.get('job_count', 0)}"
-                    ),
-                    required_skills=rec.get('missing_skills', []),
-                    salary_range=salary_text,
-                    job_outlook=f"Market score {rec.get('market_score', 0)}"
-                )
-
-            serializer = self.get_serializer(resume)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        uploads = request.FILES.getlist('files')
+        archive = request.FILES.get('archive')
+        if not uploads and archive is None:
+            return Response(
+                {'error': 'Provide an archive or one or more files'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        except Exception as e:
+        max_files = settings.BATCH_ANALYSIS_MAX_FILES
+        max_file_bytes = settings.BATCH_ANALYSIS_MAX_FILE_BYTES
+        persist = str(request.data.get('persist', '')).lower() in ('1', 'true', 'yes')
+        workspace = tempfile.mkdtemp(prefix='resume-batch-')
+
+        try:
+            names = {}
+            if archive is not None:
+                names.update(extract_archive(archive, workspace, max_files, max_file_bytes))
+            for upload in uploads:
+                if len(names) >= max_files:
+                    raise ValueError(f'At most {max_files} resumes per batch')
+                if upload.size > max_file_bytes:
+                    raise ValueError(f'{upload.name} exceeds the per-file size limit')
+                path = os.path.join(workspace, f'{len(names):05d}_{os.path.basename(upload.name)}')
+                if hasattr(upload, 'temporary_file_path'):
+                    # Already spooled to disk by Django; move it rather than copy.
+                    file_move_safe(upload.temporary_file_path(), path)
+                else:
+                    with open(path, 'wb') as destination:
+                        for chunk in upload.chunks():
+                            destination.write(chunk)
+                names[path] = upload.name
+        except (ValueError, zipfile.BadZipFile) as e:
+            shutil.rmtree(workspace, ignore_errors=True)
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        user = request.user if persist else None
+
+        def stream():
+            try:
+                for result in run_batch_analysis(
+                    list(names), user=user, names=names, executor=get_executor()
+                ):
+                    yield json.dumps(result) + '\n'
+            finally:
+                shutil.rmtree(workspace, ignore_errors=True)
+
+        return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+    @action(detail=False, methods=['post'])
+    def submit(self, request):
+        """Upload resume and queue it for background analysis"""
+        if upload_too_large(request):
             return Response(
-                {'error': f'Resume analysis failed: {str(e)}'},
+                {'error': upload_too_large_message()},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        if 'file' not in request.FILES:
+            return Response(
+                {'error': 'No resume file provided'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        finally:
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
+
+        resume_file = request.FILES['file']
+        title = request.data.get('title', resume_file.name)
+        job = create_analysis_job(request.user, resume_file, title)
+
+        serializer = AnalysisJobSerializer(job)
+        status_url = request.build_absolute_uri(
+            reverse('resume-job-status', kwargs={'job_id': job.id})
+        )
+        return Response(
+            {**serializer.data, 'status_url': status_url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': status_url}
+        )
+
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>\d+)')
+    def job_status(self, request, job_id=None):
+        """Poll the status of a background analysis job"""
+        try:
+            job = AnalysisJob.objects.get(id=job_id, user=request.user)
+        except AnalysisJob.DoesNotExist:
+            return Response(
+                {'error': 'Job not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = AnalysisJobSerializer(job)
+        return Response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def recommendations(self, request, pk=None):
@@ -272,18 +365,85 @@ class CareerRecommendationViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'])
     def top_matches(self, request):
-        threshold = float(request.query_params.get('threshold', 20))
+        try:
+            threshold = float(request.query_params.get('threshold', 20))
+            limit = int(request.query_params.get('limit', 5))
+            resume_id = request.query_params.get('resume')
+            resume_id = int(resume_id) if resume_id else None
+        except ValueError:
+            return Response(
+                {'error': 'threshold must be a number; limit and resume must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, 100))
+
+        cache_key = top_matches_key(request.user.pk, threshold, limit, resume_id)
+        payload = get_top_matches(cache_key)
+        if payload is not None:
+            return Response(payload)
+
+        filtered = self.get_queryset().filter(match_score__gt=threshold)
+        if resume_id is not None:
+            filtered = filtered.filter(resume_id=resume_id)
+
+        # The window count is computed before LIMIT, so one query returns
+        # both the page and the total.
+        top = list(
+            filtered
+            .annotate(total_matches=Window(expression=Count('id')))
+            .order_by('-match_score')[:limit]
+        )
 
-        all_recommendations = self.get_queryset().order_by('-match_score')
+        payload = {
+            "total_matches": top[0].total_matches if top else 0,
+            "results": self.get_serializer(top, many=True).data
+        }
+        set_top_matches(cache_key, payload)
+        return Response(payload)
 
-        filtered = all_recommendations.filter(match_score__gt=threshold)
 
-        serializer = self.get_serializer(filtered, many=True)
+class DashboardViewSet(viewsets.ViewSet):
+    """
+    API endpoint for the dashboard summary of a resume (the latest analyzed
+    one unless ?resume=<id> is given).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        resumes = Resume.objects.filter(user=request.user, parsed_content__isnull=False)
+        resume_id = request.query_params.get('resume')
+        if resume_id:
+            if not resume_id.isdigit():
+                return Response({'error': 'resume must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            resumes = resumes.filter(id=resume_id)
+
+        # Only loaded if the summary has to be rebuilt.
+        resume = resumes.defer('embedding', 'parsed_content').order_by('-uploaded_at').first()
+        if resume is None:
+            return Response({'error': 'No analyzed resume found'}, status=status.HTTP_404_NOT_FOUND)
+
+        version = summary_version()
+        if resume.dashboard_summary is None or resume.dashboard_version != version:
+            # Rebuild first: it bumps updated_at, which the validators use.
+            get_dashboard_summary(resume, version)
+
+        etag = quote_etag(hashlib.sha256(
+            f'{resume.pk}:{resume.updated_at.isoformat()}:{version}'.encode()
+        ).hexdigest()[:32])
+        last_modified = int(resume.updated_at.timestamp())
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response({
+                'resume': resume.pk,
+                'summary': get_dashboard_summary(resume, version)
+            })
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        # Let browsers keep the summary but revalidate it on every load.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
-        return Response({
-            "total_matches": filtered.count(),
-            "results": serializer.data[:5]
-        })
 
 class JobOpportunityViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -293,35 +453,25 @@ class JobOpportunityViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = JobOpportunity.objects.all()
     permission_classes = [AllowAny]
 
+    def _search_response(self, query, columns=SEARCH_COLUMNS):
+        page = self.paginate_queryset(search_jobs(query, columns))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Search jobs by title, company, or location"""
-        query = request.query_params.get('q', '')
-        jobs = self.queryset.filter(
-            title__icontains=query
-        ) | self.queryset.filter(
-            company__icontains=query
-        ) | self.queryset.filter(
-            location__icontains=query
-        )
-        serializer = self.get_serializer(jobs, many=True)
-        return Response(serializer.data)
+        """Search jobs by title, company, or location, best match first"""
+        return self._search_response(request.query_params.get('q', ''))
 
     @action(detail=False, methods=['get'])
     def by_location(self, request):
         """Filter jobs by location"""
-        location = request.query_params.get('location', '')
-        jobs = self.queryset.filter(location__icontains=location)
-        serializer = self.get_serializer(jobs, many=True)
-        return Response(serializer.data)
+        return self._search_response(request.query_params.get('location', ''), ['location'])
 
     @action(detail=False, methods=['get'])
     def by_title(self, request):
         """Filter jobs by career title"""
-        title = request.query_params.get('title', '')
-        jobs = self.queryset.filter(title__icontains=title)
-        serializer = self.get_serializer(jobs, many=True)
-        return Response(serializer.data)
+        return self._search_response(request.query_params.get('title', ''), ['title'])
 
 
 class SavedJobViewSet(viewsets.ModelViewSet):
@@ -422,50 +572,59 @@ def analyze_resume(request):
     Legacy endpoint for resume analysis.
     Kept for backward compatibility.
     """
+    if upload_too_large(request):
+        return JsonResponse({"error": upload_too_large_message()}, status=413)
+
     if "resume" not in request.FILES:
         return JsonResponse({"error": "No resume uploaded"}, status=400)
 
-    resume_file = request.FILES["resume"]
-    _, extension = os.path.splitext(resume_file.name or "")
-    suffix = extension.lower() if extension else ".pdf"
-    file_path = None
-
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as destination:
-            file_path = destination.name
-            for chunk in resume_file.chunks():
-                destination.write(chunk)
-
-        parsed_resume = parse_resume(file_path)
-        recommendations = recommend_careers(parsed_resume)
-        saved_resume_id = None
-        save_error = None
-        try:
-            analysis_user = resolve_user_for_analysis(request)
-            if analysis_user is None:
-                return JsonResponse({"error": "Authentication required for analysis."}, status=401)
-            saved_resume = persist_resume_analysis(
-                user=analysis_user,
-                resume_file=resume_file,
-                parsed_resume=parsed_resume,
-                recommendations=recommendations
-            )
-            saved_resume_id = saved_resume.id
-        except Exception as persist_error:
-            save_error = str(persist_error)
+        options = ranking_options(request.POST)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-        payload = {
-            "parsed_resume": parsed_resume,
-            "recommendations": recommendations
-        }
-        if saved_resume_id:
-            payload["saved_resume_id"] = saved_resume_id
-        if save_error:
-            payload["save_error"] = save_error
+    analysis_user = resolve_user_for_analysis(request)
+    if analysis_user is None:
+        return JsonResponse({"error": "Authentication required for analysis."}, status=401)
 
-        return JsonResponse(payload)
+    try:
+        saved_resume, parsed_resume, recommendations = store_and_analyze(
+            analysis_user, request.FILES["resume"], **options
+        )
+    except AnalysisSaveError as e:
+        # The analysis itself succeeded; return it as this endpoint always has.
+        return JsonResponse({
+            "parsed_resume": e.parsed_resume,
+            "recommendations": e.recommendations,
+            "save_error": str(e)
+        })
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
-    finally:
-        if file_path and os.path.exists(file_path):
-            os.remove(file_path)
+
+    return JsonResponse({
+        "parsed_resume": parsed_resume,
+        "recommendations": recommendations,
+        "saved_resume_id": saved_resume.id
+    })
+
+
+def metrics_allowed(request):
+    """Whether request may read /metrics (see the METRICS_* settings)."""
+    if settings.DEBUG or settings.METRICS_PUBLIC:
+        return True
+    if request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS:
+        return True
+    token = settings.METRICS_TOKEN
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and hmac.compare_digest(header, f'Bearer {token}')
+
+
+@require_http_methods(["GET"])
+def metrics(request):
+    """Pipeline stage latency and encoder batching metrics in Prometheus text format (this process only)."""
+    if not metrics_allowed(request):
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    return HttpResponse(
+        render_prometheus() + render_service_metrics(),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,107 @@
+"""
+Accuracy and latency check for the onnx-int8 encoder backend.
+
+Ranks career_profiles.json for synthetic resumes with the fp32
+SentenceTransformer and with the int8 ONNX encoder, and fails if the
+rankings drift. Two int8 setups are checked: everything re-encoded with
+int8, and int8 resumes against the fp32 profile embeddings (what the
+service does, since profile_embeddings.pkl is built with fp32).
+Latency is measured on the raw models, bypassing the embedding cache.
+
+    cd backend && python -m benchmarks.bench_encoder
+"""
+import json
+import random
+import time
+
+import numpy as np
+
+from ml.models.embedding_model import MODEL_NAME, get_model
+from ml.pipeline.recommendation_engine import build_resume_profile
+from ml.pipeline.skill_embeddings import PROFILES_FILE, normalize_rows
+
+MIN_TOP1_AGREEMENT = 0.95
+MIN_OVERLAP_AT_K = 0.90
+
+
+def make_resumes(rng, profiles, n_resumes):
+    resumes = []
+    for _ in range(n_resumes):
+        profile = rng.choice(profiles)
+        skills = profile.get("skills", [])
+        resumes.append(build_resume_profile({
+            "degree": rng.choice(["btech", "bsc", "mba", "msc", "phd"]),
+            "experience_years": rng.randint(0, 15),
+            "technical_skills": {"skills": rng.sample(skills, min(len(skills), rng.randint(3, 8)))}
+        }))
+    return resumes
+
+
+def rankings(queries, corpus, k):
+    scores = normalize_rows(queries) @ normalize_rows(corpus).T
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def compare(reference, candidate):
+    top1 = float(np.mean(reference[:, 0] == candidate[:, 0]))
+    overlap = float(np.mean([
+        len(set(r) & set(c)) / len(r) for r, c in zip(reference, candidate)
+    ]))
+    return top1, overlap
+
+
+def latency(model, texts, repeat):
+    model.encode(texts[:1])
+    single = []
+    for text in texts[:repeat]:
+        started = time.perf_counter()
+        model.encode([text])
+        single.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    model.encode(texts, batch_size=64)
+    batch = time.perf_counter() - started
+
+    return np.percentile(single, 50), np.percentile(single, 95), len(texts) / batch
+
+
+def main(n_resumes=300, repeat=100, k=5, seed=7):
+    with open(PROFILES_FILE, "r") as f:
+        profiles = json.load(f)
+
+    rng = random.Random(seed)
+    resumes = make_resumes(rng, profiles, n_resumes)
+    corpus_texts = [p.get("embedding_text") or p["description"] for p in profiles]
+
+    fp32 = get_model(MODEL_NAME, "sentence-transformers")
+    int8 = get_model(MODEL_NAME, "onnx-int8")
+
+    fp32_corpus, fp32_queries = fp32.encode(corpus_texts), fp32.encode(resumes)
+    int8_corpus, int8_queries = int8.encode(corpus_texts), int8.encode(resumes)
+
+    cosine = np.sum(normalize_rows(fp32_queries) * normalize_rows(int8_queries), axis=1)
+    reference = rankings(fp32_queries, fp32_corpus, k)
+    results = {
+        "int8 resumes + int8 profiles": compare(reference, rankings(int8_queries, int8_corpus, k)),
+        "int8 resumes + fp32 profiles": compare(reference, rankings(int8_queries, fp32_corpus, k)),
+    }
+
+    print(f"resumes: {n_resumes}, profiles: {len(profiles)}")
+    print(f"cosine(fp32, int8): mean {cosine.mean():.4f}, min {cosine.min():.4f}")
+    for name, (top1, overlap) in results.items():
+        print(f"{name}: top-1 agreement {top1:.3f}, overlap@{k} {overlap:.3f}")
+
+    for name, model in (("fp32", fp32), ("int8", int8)):
+        p50, p95, throughput = latency(model, resumes, repeat)
+        print(
+            f"{name}: single p50 {p50 * 1e3:6.2f} ms, p95 {p95 * 1e3:6.2f} ms, "
+            f"batch {throughput:7.1f} texts/s"
+        )
+
+    for name, (top1, overlap) in results.items():
+        assert top1 >= MIN_TOP1_AGREEMENT, f"{name}: top-1 agreement {top1:.3f}"
+        assert overlap >= MIN_OVERLAP_AT_K, f"{name}: overlap@{k} {overlap:.3f}"
+
+
+if __name__ == "__main__":
+    main()
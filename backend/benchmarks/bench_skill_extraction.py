@@ -0,0 +1,94 @@
+"""
+Microbenchmark for resume_parser.extract_technical_skills.
+
+Compares the previous implementation (reload tech_skills.json, one
+re.search per skill) with the precompiled single-pass matcher, and checks
+that both return the same category -> skills dict.
+
+    cd backend && python -m benchmarks.bench_skill_extraction
+"""
+import random
+import re
+import time
+
+from ml.pipeline import resume_parser
+
+
+def legacy_extract_technical_skills(text):
+    skill_data = resume_parser.load_tech_skills()
+    detected = {}
+
+    section_match = re.search(
+        r'skills(.*?)(projects|education|experience)',
+        text,
+        re.DOTALL
+    )
+
+    if not section_match:
+        return {}
+
+    skills_text = section_match.group(1).lower()
+
+    for category, skills in skill_data.items():
+        matched = []
+
+        for skill in skills:
+            pattern = r"\b" + re.escape(skill.lower()) + r"\b"
+
+            if re.search(pattern, skills_text):
+                matched.append(skill)
+
+        if matched:
+            detected[category] = matched
+
+    return detected
+
+
+def make_resume(rng, vocabulary, n_skills):
+    filler = ["worked", "on", "team", "delivered", "using", "and", "with", "built"]
+    picked = rng.sample(vocabulary, n_skills)
+    words = []
+    for skill in picked:
+        words.append(skill)
+        words.append(rng.choice([",", " |", ";", " and", ", c++ developer", " (c#)"]))
+        words.extend(rng.sample(filler, 2))
+    return (
+        "john doe\nsummary\nsoftware engineer with 3 years experience\n"
+        "technical skills\n" + " ".join(words) +
+        "\nprojects\nbuilt things\neducation\nbachelor of technology\n"
+    )
+
+
+def timed(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(texts)
+
+
+def main(n_resumes=200, repeat=5, seed=7):
+    rng = random.Random(seed)
+    vocabulary = sorted({
+        skill.lower()
+        for skills in resume_parser.load_tech_skills().values()
+        for skill in skills
+    })
+    texts = [make_resume(rng, vocabulary, rng.randint(5, 40)) for _ in range(n_resumes)]
+
+    for text in texts:
+        assert legacy_extract_technical_skills(text) == resume_parser.extract_technical_skills(text)
+
+    before = timed(legacy_extract_technical_skills, texts, repeat)
+    after = timed(resume_parser.extract_technical_skills, texts, repeat)
+
+    print(f"resumes: {n_resumes}, skills in vocabulary: {len(vocabulary)}")
+    print(f"before: {before * 1e6:8.1f} us/resume")
+    print(f"after:  {after * 1e6:8.1f} us/resume")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
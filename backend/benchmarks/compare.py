@@ -0,0 +1,69 @@
+"""
+Compare two benchmarks.run result files.
+
+Prints every shared benchmark with its baseline and candidate p50 latency
+(and throughput for /analyze/) and exits with status 1 if any p50 grew,
+or throughput fell, by more than --threshold percent.
+
+    cd backend && python -m benchmarks.compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+LATENCY_KEY = "p50_ms"
+THROUGHPUT_KEY = "requests_per_second"
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(before, after):
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare(baseline, candidate, threshold):
+    """Yield (name, metric, before, after, percent_change, regressed) for shared benchmarks."""
+    before_results, after_results = baseline["results"], candidate["results"]
+    for name in sorted(set(before_results) & set(after_results)):
+        before, after = before_results[name], after_results[name]
+        if LATENCY_KEY in before and LATENCY_KEY in after:
+            delta = change(before[LATENCY_KEY], after[LATENCY_KEY])
+            yield name, LATENCY_KEY, before[LATENCY_KEY], after[LATENCY_KEY], delta, delta > threshold
+        if THROUGHPUT_KEY in before and THROUGHPUT_KEY in after:
+            delta = change(before[THROUGHPUT_KEY], after[THROUGHPUT_KEY])
+            yield name, THROUGHPUT_KEY, before[THROUGHPUT_KEY], after[THROUGHPUT_KEY], delta, delta < -threshold
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Percent change that counts as a regression")
+    args = parser.parse_args(argv)
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(f"baseline:  {baseline['meta'].get('commit')}  candidate: {candidate['meta'].get('commit')}")
+    if baseline["meta"].get("options") != candidate["meta"].get("options"):
+        print("warning: runs used different options; differences may not be comparable")
+
+    regressions = 0
+    for name, metric, before, after, delta, regressed in compare(baseline, candidate, args.threshold):
+        regressions += regressed
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{name:42} {metric:20} {before:12.3f} -> {after:12.3f} {delta:+8.1f}%{marker}")
+
+    missing = set(baseline["results"]) ^ set(candidate["results"])
+    for name in sorted(missing):
+        print(f"{name:42} only in {'baseline' if name in baseline['results'] else 'candidate'}")
+
+    if regressions:
+        print(f"{regressions} regression(s) beyond {args.threshold}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Deterministic stand-in for the sentence encoder.
+
+Each text maps to a unit vector drawn from a generator seeded with the
+benchmark seed and a hash of the text, so results are identical across
+runs and machines without downloading or loading a model. Use it to time
+the code around the encoder; use the real encoder to time the encoder.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from ml.models import embedding_model
+from ml.pipeline import skill_embeddings
+
+DIMENSION = 384
+
+
+class FakeEncoder:
+    def __init__(self, seed=7, dimension=DIMENSION):
+        self.seed = seed
+        self.dimension = dimension
+
+    def _vector(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        rng = np.random.default_rng([self.seed, int.from_bytes(digest[:8], "little")])
+        vector = rng.standard_normal(self.dimension).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, **kwargs):
+        if isinstance(sentences, str):
+            return self._vector(sentences)
+        if not len(sentences):
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return np.vstack([self._vector(s) for s in sentences])
+
+
+def install(artifact_dir, seed=7):
+    """Serve FakeEncoder for the current model and backend from embedding_model.get_model.
+
+    Fake vectors are reported under the real model's name, so the skill
+    embedding store is redirected into artifact_dir: a rebuild there can
+    never overwrite models/skill_embeddings.pkl with fake vectors.
+    """
+    encoder = FakeEncoder(seed)
+    embedding_model._models[(embedding_model.MODEL_NAME, embedding_model.get_backend())] = encoder
+    skill_embeddings.SKILL_EMBEDDING_FILE = os.path.join(artifact_dir, "skill_embeddings.pkl")
+    return encoder
@@ -0,0 +1,98 @@
+"""
+Synthetic resumes for the benchmark suite.
+
+Resumes are generated from tech_skills.json and degrees.csv with a seeded
+random.Random, so the same seed always yields the same texts and files.
+SIZES sets how many skills and filler paragraphs each size class gets;
+"large" is roughly a five-page resume.
+"""
+import os
+import random
+
+from ml.pipeline import resume_parser
+
+SIZES = {
+    "small": {"skills": 8, "paragraphs": 4},
+    "medium": {"skills": 25, "paragraphs": 20},
+    "large": {"skills": 60, "paragraphs": 80},
+}
+
+DEGREES = [
+    "bachelor of technology in computer science",
+    "b.e. in electronics and communication",
+    "master of business administration",
+    "bachelor of science in mathematics",
+    "master of science in data science",
+]
+
+FILLER = (
+    "worked with cross functional teams to deliver features on schedule",
+    "designed and maintained services used by internal and external customers",
+    "improved reliability and reduced operating cost across several releases",
+    "mentored junior engineers and reviewed code for the wider team",
+    "collaborated with product and design to scope and ship new workflows",
+)
+
+
+def skill_vocabulary():
+    return sorted({
+        skill.lower()
+        for skills in resume_parser.load_tech_skills().values()
+        for skill in skills
+    })
+
+
+def make_resume_text(rng, size, vocabulary):
+    spec = SIZES[size]
+    skills = rng.sample(vocabulary, min(spec["skills"], len(vocabulary)))
+    years = rng.randint(0, 15)
+
+    lines = [
+        "jane doe",
+        "summary",
+        f"engineer with {years} years of experience",
+        "technical skills",
+        ", ".join(skills),
+        "experience",
+    ]
+    for i in range(spec["paragraphs"]):
+        lines.append(f"role {i + 1}: {rng.choice(FILLER)} using {rng.choice(skills)}")
+    lines += [
+        "projects",
+        f"built an internal tool with {rng.choice(skills)} and {rng.choice(skills)}",
+        "education",
+        rng.choice(DEGREES),
+    ]
+    return "\n".join(lines)
+
+
+def make_resume_texts(seed=7, per_size=5, sizes=tuple(SIZES)):
+    """{size: [text, ...]} with per_size resumes of each size."""
+    rng = random.Random(seed)
+    vocabulary = skill_vocabulary()
+    return {
+        size: [make_resume_text(rng, size, vocabulary) for _ in range(per_size)]
+        for size in sizes
+    }
+
+
+def write_docx(text, path):
+    import docx
+
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+    return path
+
+
+def write_resume_files(texts, directory):
+    """Write {size: [text]} as DOCX files; returns {size: [path]}."""
+    os.makedirs(directory, exist_ok=True)
+    return {
+        size: [
+            write_docx(text, os.path.join(directory, f"{size}-{i}.docx"))
+            for i, text in enumerate(size_texts)
+        ]
+        for size, size_texts in texts.items()
+    }
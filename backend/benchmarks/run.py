@@ -0,0 +1,255 @@
+"""
+Benchmark suite for the resume analysis pipeline and the /analyze/ endpoint.
+
+Everything runs against generated inputs (benchmarks.fixtures) and a local
+Adzuna stub (benchmarks.stub_adzuna). Databases, media files and caches
+go to a temporary directory. By default the encoder is benchmarks.fake_encoder;
+pass --encoder real to include the sentence encoder itself. The embedding
+cache is disabled unless --embedding-cache is given, so every call pays
+for its encodes.
+
+Measured:
+  - latency of parse_resume, extract_technical_skills, recommend_careers
+    and build_dashboard_summary per resume size
+  - /analyze/ throughput and latency with --clients concurrent clients
+    (in-process Django test clients; no network server in between)
+
+Results are written as JSON (--output, default stdout) and can be compared
+between commits with benchmarks.compare:
+
+    cd backend
+    python -m benchmarks.run --output before.json
+    git checkout <change> && python -m benchmarks.run --output after.json
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "calls": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4) if ordered else 0.0,
+    }
+
+
+def time_calls(fn, inputs, repeat):
+    fn(inputs[0])
+    samples = []
+    for _ in range(repeat):
+        for value in inputs:
+            started = time.perf_counter()
+            fn(value)
+            samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def bench_functions(texts, paths, repeat):
+    from ml.pipeline.dashboard_builder import build_dashboard_summary
+    from ml.pipeline.recommendation_engine import recommend_careers
+    from ml.pipeline.resume_parser import extract_technical_skills, parse_resume
+
+    results = {}
+    for size, size_texts in texts.items():
+        parsed = [parse_resume(path) for path in paths[size]]
+        lowered = [text.lower() for text in size_texts]
+
+        results[f"parse_resume[{size}]"] = time_calls(parse_resume, paths[size], repeat)
+        results[f"extract_technical_skills[{size}]"] = time_calls(
+            extract_technical_skills, lowered, repeat
+        )
+        results[f"recommend_careers[{size}]"] = time_calls(recommend_careers, parsed, repeat)
+        results[f"build_dashboard_summary[{size}]"] = time_calls(
+            build_dashboard_summary, parsed, repeat
+        )
+    return results
+
+
+def bench_analyze(texts, workspace, clients, requests_per_client):
+    """POST distinct resumes to /analyze/ from concurrent clients."""
+    from django.test import Client
+
+    from benchmarks.fixtures import write_docx
+
+    size_texts = [text for group in texts.values() for text in group]
+    total = clients * requests_per_client
+    upload_dir = os.path.join(workspace, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+
+    uploads = []
+    for i in range(total):
+        # A unique line per request keeps the content-hash cache from
+        # answering repeats.
+        path = os.path.join(upload_dir, f"upload-{i}.docx")
+        write_docx(f"{size_texts[i % len(size_texts)]}\nreference {i}", path)
+        with open(path, "rb") as f:
+            uploads.append(f.read())
+
+    def run_client(client_number):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.db import connection
+
+        client = Client()
+        latencies, errors = [], 0
+        try:
+            for i in range(client_number, total, clients):
+                started = time.perf_counter()
+                response = client.post("/analyze/", {
+                    "resume": SimpleUploadedFile(f"resume-{i}.docx", uploads[i]),
+                    "username": f"bench-{client_number}",
+                })
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+        finally:
+            connection.close()
+        return latencies, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        outcomes = list(executor.map(run_client, range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for client_latencies, _ in outcomes for latency in client_latencies]
+    return {
+        "clients": clients,
+        "requests": total,
+        "errors": sum(errors for _, errors in outcomes),
+        "seconds": round(elapsed, 4),
+        "requests_per_second": round(total / elapsed, 4) if elapsed else 0.0,
+        **summarize(latencies),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_environment(workspace, embedding_cache):
+    """Point every on-disk artifact the pipeline writes at the workspace; run before importing ml."""
+    os.environ["MARKET_CACHE_PATH"] = os.path.join(workspace, "market_cache.sqlite3")
+    os.environ["MARKET_CACHE_BACKEND"] = "sqlite"
+    if not embedding_cache:
+        os.environ["EMBEDDING_CACHE_PATH"] = ""
+        os.environ["EMBEDDING_CACHE_LRU_SIZE"] = "0"
+    else:
+        os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(workspace, "embedding_cache.sqlite3")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+
+def setup_django(workspace):
+    """Set up Django on a throwaway database; returns the name to pass to destroy_test_db."""
+    import django
+
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import override_settings, setup_test_environment
+
+    override_settings(
+        MEDIA_ROOT=os.path.join(workspace, "media"),
+        CACHES={
+            alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": alias}
+            for alias in ("default", "analysis", "responses")
+        },
+    ).enable()
+    setup_test_environment()
+
+    old_name = connection.settings_dict["NAME"]
+    if connection.vendor == "sqlite":
+        # A file rather than the default in-memory database, so concurrent
+        # /analyze/ clients on separate threads share it.
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(workspace, "bench.sqlite3")
+    connection.creation.create_test_db(verbosity=0)
+    return old_name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--per-size", type=int, default=5, help="Resumes generated per size class")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over each input set")
+    parser.add_argument("--encoder", choices=("fake", "real"), default="fake")
+    parser.add_argument("--embedding-cache", action="store_true",
+                        help="Keep the embedding cache enabled (in the workspace)")
+    parser.add_argument("--adzuna-latency-ms", type=float, default=20)
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent /analyze/ clients")
+    parser.add_argument("--requests", type=int, default=10, help="/analyze/ requests per client")
+    parser.add_argument("--skip-http", action="store_true", help="Only run the function benchmarks")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="resume-bench-") as workspace:
+        configure_environment(workspace, args.embedding_cache)
+        database_name = setup_django(workspace)
+
+        from benchmarks import fake_encoder, fixtures, stub_adzuna
+
+        server = stub_adzuna.start(latency_ms=args.adzuna_latency_ms)
+        if args.encoder == "fake":
+            fake_encoder.install(workspace, seed=args.seed)
+
+        try:
+            texts = fixtures.make_resume_texts(seed=args.seed, per_size=args.per_size)
+            paths = fixtures.write_resume_files(texts, os.path.join(workspace, "fixtures"))
+
+            results = bench_functions(texts, paths, args.repeat)
+            if not args.skip_http:
+                results["analyze_endpoint"] = bench_analyze(
+                    texts, workspace, args.clients, args.requests
+                )
+        finally:
+            server.shutdown()
+            from django.db import connection
+
+            connection.creation.destroy_test_db(database_name, verbosity=0)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "options": vars(args),
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
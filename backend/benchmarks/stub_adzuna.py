@@ -0,0 +1,81 @@
+"""
+Local HTTP server that answers Adzuna search requests.
+
+Responses are derived from the requested title and page only, with an
+optional fixed delay per request, so market lookups in benchmarks cost
+the same on every run and never leave the machine.
+
+    server = start(latency_ms=20)   # points adzuna_fetcher at it
+    ...
+    server.shutdown()
+"""
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from ml.pipeline import adzuna_fetcher
+
+CITIES = ("Bengaluru", "Pune", "Hyderabad", "Mumbai", "Chennai")
+
+
+def search_results(title, page, per_page):
+    """Adzuna-shaped response for a title; totals vary by title but not between runs."""
+    seed = zlib.crc32(title.encode("utf-8"))
+    total = seed % 40000
+    first = (page - 1) * per_page
+    results = []
+    for i in range(first, min(first + per_page, total)):
+        salary = 300000 + (seed + i * 7919) % 1500000
+        results.append({
+            "id": f"{seed}-{i}",
+            "title": title.title(),
+            "company": {"display_name": f"Company {(seed + i) % 97}"},
+            "location": {"display_name": CITIES[i % len(CITIES)]},
+            "description": f"{title} role {i}",
+            "salary_min": salary,
+            "salary_max": salary + 200000,
+            "redirect_url": f"https://example.com/jobs/{seed}/{i}",
+            "created": "2026-01-01T00:00:00Z",
+        })
+    return {"count": total, "results": results}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            page = int(url.path.rstrip("/").rsplit("/", 1)[-1])
+        except ValueError:
+            page = 1
+        body = json.dumps(search_results(
+            query.get("what", [""])[0],
+            page,
+            int(query.get("results_per_page", ["100"])[0])
+        )).encode("utf-8")
+
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start(latency_ms=0, port=0):
+    handler = type("Handler", (StubHandler,), {"latency": latency_ms / 1000})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-adzuna", daemon=True).start()
+
+    adzuna_fetcher.API_URL = f"http://127.0.0.1:{server.server_port}"
+    return server
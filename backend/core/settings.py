@@ -56,6 +56,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.StageTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -89,6 +90,49 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Parsed resumes and recommendation lists keyed by upload content hash
+    # (api.analysis_cache). File-based so gunicorn workers and analysis job
+    # processes share it; culled once MAX_ENTRIES is reached.
+    'analysis': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'analysis'),
+        'TIMEOUT': 6 * 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+    # Per-user API responses (api.recommendation_cache). Shared across
+    # processes because analysis job workers invalidate entries.
+    'responses': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'responses'),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # Adzuna market data when MARKET_CACHE_BACKEND=django
+    # (ml.pipeline.market_cache, alias set by MARKET_CACHE_ALIAS). Must be
+    # durable and shared across workers; swap in Redis or Memcached to
+    # share it across hosts.
+    'market': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'market'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -191,4 +235,73 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
-]
\ No newline at end of file
+]
+
+# ==================== ML Pipeline Configuration ====================
+
+# Load the sentence encoder and profile index in ApiConfig.ready(). Enable
+# for gunicorn (ideally with --preload so forked workers share one copy);
+# leave off so manage.py commands start without importing torch.
+ML_WARMUP_ON_STARTUP = os.environ.get('ML_WARMUP_ON_STARTUP', '0') == '1'
+
+# Sentence encoder backend: 'sentence-transformers' (fp32 PyTorch) or
+# 'onnx-int8' (quantized ONNX Runtime; export with
+# `python -m ml.models.onnx_encoder`). Check accuracy and latency with
+# `python -m benchmarks.bench_encoder` before switching.
+ML_ENCODER_BACKEND = os.environ.get('ENCODER_BACKEND', 'sentence-transformers')
+
+# Coalesce encodes from concurrent requests into one forward pass (up to
+# ML_ENCODER_MAX_BATCH_SIZE texts, waiting at most ML_ENCODER_MAX_WAIT_MS).
+# Worth enabling with threaded or async workers (e.g. gunicorn --threads),
+# where one model per process then serves every thread; with one
+# single-threaded worker per process it only adds the wait.
+ML_ENCODER_MICRO_BATCHING = os.environ.get('ENCODER_MICRO_BATCHING', '0') == '1'
+ML_ENCODER_MAX_BATCH_SIZE = int(os.environ.get('ENCODER_MAX_BATCH_SIZE', '32'))
+ML_ENCODER_MAX_WAIT_MS = float(os.environ.get('ENCODER_MAX_WAIT_MS', '5'))
+
+# Storage type of Resume.embedding: 'float16' halves the column size and
+# moves cosine scores by well under 0.01; 'float32' stores encoder output
+# as is. Existing rows keep the type they were written with.
+RESUME_EMBEDDING_DTYPE = os.environ.get('RESUME_EMBEDDING_DTYPE', 'float16')
+
+# Stage timings (ml.pipeline.tracing) are always recorded and served at
+# /metrics. ML_STAGE_TIMINGS_HEADER adds each request's breakdown as an
+# X-Stage-Timings response header. ML_PROFILE_DIR, when set, profiles every
+# request with ML_PROFILER ('cprofile' or 'pyinstrument') and writes one
+# file per request there; it slows requests down, so use it locally.
+ML_STAGE_TIMINGS_HEADER = os.environ.get('ML_STAGE_TIMINGS_HEADER', '0') == '1'
+ML_PROFILE_DIR = os.environ.get('ML_PROFILE_DIR', '')
+ML_PROFILER = os.environ.get('ML_PROFILER', 'cprofile')
+
+# Who may read /metrics. Open to everyone when DEBUG or METRICS_PUBLIC is
+# on; otherwise only to clients in METRICS_ALLOWED_IPS (comma-separated)
+# or presenting "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_PUBLIC = os.environ.get('METRICS_PUBLIC', '0') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [
+    ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()
+]
+
+# Worker processes for background resume analysis and batch parsing
+# (api.jobs). The pool is per server process: every gunicorn worker that
+# submits a job spawns its own ANALYSIS_WORKERS processes, each loading its
+# own encoder (several hundred MB), so budget memory for
+# gunicorn workers x ANALYSIS_WORKERS encoders and keep the total at or
+# below the number of cores.
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', '2'))
+
+# Seconds a job may stay pending (since submission) or running (since it
+# started) before recover_analysis_jobs treats it as lost.
+ANALYSIS_JOB_TIMEOUT = int(os.environ.get('ANALYSIS_JOB_TIMEOUT', '1800'))
+
+# Largest upload accepted by the single-resume endpoints (upload_and_analyze,
+# submit and /analyze/). Checked against Content-Length before the body is
+# read (api.uploads).
+RESUME_UPLOAD_MAX_BYTES = int(os.environ.get('RESUME_UPLOAD_MAX_BYTES', str(10 * 1024 * 1024)))
+
+# Limits for POST /api/resumes/batch_analyze/. MAX_BYTES caps the whole
+# request body and is checked like RESUME_UPLOAD_MAX_BYTES, before any
+# file is read. The per-file and file-count limits apply after parsing.
+BATCH_ANALYSIS_MAX_FILES = int(os.environ.get('BATCH_ANALYSIS_MAX_FILES', '5000'))
+BATCH_ANALYSIS_MAX_FILE_BYTES = int(os.environ.get('BATCH_ANALYSIS_MAX_FILE_BYTES', str(10 * 1024 * 1024)))
+BATCH_ANALYSIS_MAX_BYTES = int(os.environ.get('BATCH_ANALYSIS_MAX_BYTES', str(512 * 1024 * 1024)))
@@ -0,0 +1,253 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Set EMBEDDING_CACHE_PATH to an empty string to keep the cache in memory only.
+CACHE_PATH = os.environ.get(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(BASE_DIR, "embedding_cache.sqlite3")
+)
+# Entries kept in memory by each process, in front of the shared on-disk
+# tier. One 384-dimension entry is about 1.5 KB, so the default costs
+# about 6 MB in every server and analysis worker process.
+LRU_SIZE = int(os.environ.get("EMBEDDING_CACHE_LRU_SIZE", "4096"))
+# "float32" or "float16" (half the disk; cosine scores move by ~1e-4).
+STORE_DTYPE = np.dtype(os.environ.get("EMBEDDING_CACHE_DTYPE", "float32"))
+# Bounds on the on-disk tier, across all models: rows not used for
+# MAX_AGE_DAYS are dropped, then the least recently used rows beyond
+# MAX_ROWS. 0 disables either bound. Pruning runs after every
+# PRUNE_INTERVAL inserts.
+MAX_ROWS = int(os.environ.get("EMBEDDING_CACHE_MAX_ROWS", "500000"))
+MAX_AGE_DAYS = float(os.environ.get("EMBEDDING_CACHE_MAX_AGE_DAYS", "90"))
+PRUNE_INTERVAL = 1000
+# Hits refresh a row's last-used time at most this often.
+TOUCH_INTERVAL = 24 * 3600
+
+
+def normalize_text(text):
+    # Only collapse differences the tokenizer ignores anyway, so a cache
+    # hit always returns what the model would have produced.
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def text_key(text):
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class SQLiteStore:
+    """On-disk tier shared by every process on the host."""
+
+    def __init__(self, path, dtype=STORE_DTYPE, max_rows=MAX_ROWS, max_age_days=MAX_AGE_DAYS):
+        self.path = path
+        self.dtype = dtype
+        self.max_rows = max_rows
+        self.max_age = max_age_days * 86400
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._ready = False
+        self._inserted = 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._ready:
+            with self._init_lock:
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS embeddings ("
+                        "model TEXT NOT NULL, key TEXT NOT NULL, "
+                        "dtype TEXT NOT NULL, vector BLOB NOT NULL, "
+                        "used_at INTEGER NOT NULL DEFAULT 0, "
+                        "PRIMARY KEY (model, key))"
+                    )
+                    columns = [row[1] for row in conn.execute("PRAGMA table_info(embeddings)")]
+                    if "used_at" not in columns:
+                        # Stores created before used_at; existing rows count as unused.
+                        conn.execute(
+                            "ALTER TABLE embeddings ADD COLUMN used_at INTEGER NOT NULL DEFAULT 0"
+                        )
+                    conn.execute(
+                        "CREATE INDEX IF NOT EXISTS embeddings_used_at ON embeddings (used_at)"
+                    )
+                self._ready = True
+        return conn
+
+    def get_many(self, model_name, keys):
+        found = {}
+        conn = self._connection()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, dtype, vector FROM embeddings "
+                f"WHERE model = ? AND key IN ({placeholders})",
+                [model_name] + chunk
+            )
+            for key, dtype, vector in rows:
+                found[key] = np.frombuffer(vector, dtype=dtype).astype(np.float32)
+
+        if found:
+            now = int(time.time())
+            hits = list(found)
+            with conn:
+                for start in range(0, len(hits), 500):
+                    chunk = hits[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    conn.execute(
+                        f"UPDATE embeddings SET used_at = ? "
+                        f"WHERE model = ? AND key IN ({placeholders}) AND used_at < ?",
+                        [now, model_name] + chunk + [now - TOUCH_INTERVAL]
+                    )
+        return found
+
+    def set_many(self, model_name, vectors):
+        conn = self._connection()
+        now = int(time.time())
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, dtype, vector, used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (model_name, key, self.dtype.name, vector.astype(self.dtype).tobytes(), now)
+                    for key, vector in vectors.items()
+                ]
+            )
+
+        with self._init_lock:
+            self._inserted += len(vectors)
+            due = self._inserted >= PRUNE_INTERVAL
+            if due:
+                self._inserted = 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Apply the age and row bounds; returns how many rows were deleted."""
+        conn = self._connection()
+        deleted = 0
+        with conn:
+            if self.max_age:
+                deleted += conn.execute(
+                    "DELETE FROM embeddings WHERE used_at < ?",
+                    (int(time.time() - self.max_age),)
+                ).rowcount
+            if self.max_rows:
+                excess = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_rows
+                if excess > 0:
+                    deleted += conn.execute(
+                        "DELETE FROM embeddings WHERE rowid IN ("
+                        "SELECT rowid FROM embeddings ORDER BY used_at LIMIT ?)",
+                        (excess,)
+                    ).rowcount
+        return deleted
+
+
+class EmbeddingCache:
+    """Embeddings keyed by (model name, normalized text).
+
+    Lookups go to an in-process LRU, then the on-disk store; only texts
+    missing from both reach the model, in a single encode call.
+    """
+
+    def __init__(self, model_name, path=CACHE_PATH, lru_size=LRU_SIZE, dtype=STORE_DTYPE):
+        self.model_name = model_name
+        self.store = SQLiteStore(path, dtype) if path else None
+        self.dtype = dtype
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "model_name": self.model_name,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "lru_entries": len(self._lru)
+            }
+
+    def _remember(self, key, vector):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def encode(self, encode, texts, **kwargs):
+        """Return a float32 matrix with one row per text.
+
+        encode is called once, with only the texts missing from both tiers.
+        """
+        keys = [text_key(text) for text in texts]
+        vectors = {}
+        missing = []
+
+        with self._lock:
+            for key in keys:
+                vector = self._lru.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._lru.move_to_end(key)
+                    vectors[key] = vector
+            self.memory_hits += len(keys) - len(missing)
+
+        missing = list(dict.fromkeys(missing))
+
+        if missing and self.store is not None:
+            loaded = self.store.get_many(self.model_name, missing)
+            with self._lock:
+                self.disk_hits += len(loaded)
+                for key, vector in loaded.items():
+                    self._remember(key, vector)
+            vectors.update(loaded)
+            missing = [key for key in missing if key not in loaded]
+
+        if missing:
+            texts_by_key = dict(zip(keys, texts))
+            encoded = np.asarray(
+                encode([texts_by_key[key] for key in missing], **kwargs),
+                dtype=np.float32
+            )
+            # Round-trip through the storage dtype so every tier returns
+            # the same values.
+            encoded = {
+                key: vector.astype(self.dtype).astype(np.float32)
+                for key, vector in zip(missing, encoded)
+            }
+            if self.store is not None:
+                self.store.set_many(self.model_name, encoded)
+            with self._lock:
+                self.misses += len(missing)
+                for key, vector in encoded.items():
+                    self._remember(key, vector)
+            vectors.update(encoded)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name):
+    with _caches_lock:
+        if model_name not in _caches:
+            _caches[model_name] = EmbeddingCache(model_name)
+        return _caches[model_name]
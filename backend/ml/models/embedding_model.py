@@ -1,6 +1,154 @@
-from sentence_transformers import SentenceTransformer
+import os
+import threading
+from ml.models.embedding_cache import get_embedding_cache
+from ml.models.embedding_service import (
+    MAX_BATCH_SIZE, MAX_WAIT_MS, EmbeddingService, render_prometheus
+)
+from ml.pipeline.tracing import stage
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# "sentence-transformers" runs the fp32 PyTorch model; "onnx-int8" runs a
+# dynamically quantized ONNX export on onnxruntime (ml.models.onnx_encoder).
+DEFAULT_BACKEND = "sentence-transformers"
+BACKENDS = (DEFAULT_BACKEND, "onnx-int8")
+
+_backend = os.environ.get("ENCODER_BACKEND", DEFAULT_BACKEND)
+
+# Route small cache-miss encodes through a per-process EmbeddingService so
+# concurrent requests (threaded or async workers) share forward passes.
+_micro_batching = {
+    "enabled": os.environ.get("ENCODER_MICRO_BATCHING", "0") == "1",
+    "max_batch_size": MAX_BATCH_SIZE,
+    "max_wait_ms": MAX_WAIT_MS,
+}
+
+_models = {}
+_lock = threading.Lock()
+
+
+def set_backend(backend):
+    """Select the encoder backend; call before the first encode."""
+    global _backend
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend}")
+    _backend = backend
+
+
+def set_micro_batching(enabled, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+    """Configure micro-batching; call before the first encode."""
+    _micro_batching.update(
+        enabled=enabled,
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms
+    )
+
+
+def get_backend():
+    return _backend
+
+
+def encoder_id(model_name=MODEL_NAME, backend=None):
+    """Identifies the vectors an encoder produces, for cache and artifact keys."""
+    backend = backend or _backend
+    if backend == DEFAULT_BACKEND:
+        return model_name
+    return f"{model_name}@{backend}"
+
+
+def load_model(model_name, backend):
+    # Imported here so that importing the pipeline (and therefore
+    # every manage.py command) does not pay for torch or onnxruntime.
+    if backend == "onnx-int8":
+        from ml.models.onnx_encoder import OnnxEncoder
+        return OnnxEncoder(model_name)
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def get_model(model_name=MODEL_NAME, backend=None):
+    key = (model_name, backend or _backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        if key not in _models:
+            _models[key] = load_model(*key)
+        return _models[key]
+
+
+class CachedEncoder:
+    """Drop-in for model.encode that goes through the embedding cache.
+
+    The model itself is only loaded when a text misses every cache tier.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, backend=None):
+        self.model_name = model_name
+        self.backend = backend or _backend
+        self.cache = get_embedding_cache(encoder_id(model_name, self.backend))
+        self.service = None
+        if _micro_batching["enabled"]:
+            self.service = EmbeddingService(
+                self._encode_direct,
+                max_batch_size=_micro_batching["max_batch_size"],
+                max_wait_ms=_micro_batching["max_wait_ms"]
+            )
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            return self.encode([texts], **kwargs)[0]
+        with stage("encode"):
+            return self.cache.encode(self._encode_uncached, list(texts), **kwargs)
+
+    def _encode_uncached(self, texts, **kwargs):
+        # Bulk callers (explicit batch_size, progress bars) already batch.
+        if self.service is not None and not kwargs and len(texts) < self.service.max_batch_size:
+            return self.service.encode(texts)
+        return self._encode_direct(texts, **kwargs)
+
+    def _encode_direct(self, texts, **kwargs):
+        with stage("encode_model"):
+            return get_model(self.model_name, self.backend).encode(texts, **kwargs)
+
+    def stats(self):
+        stats = {"cache": self.cache.stats()}
+        if self.service is not None:
+            stats["micro_batching"] = self.service.stats()
+        return stats
+
+
+_encoders = {}
+
+
+def get_encoder(model_name=MODEL_NAME):
+    key = (model_name, _backend)
+    encoder = _encoders.get(key)
+    if encoder is None:
+        with _lock:
+            encoder = _encoders.setdefault(key, CachedEncoder(*key))
+    return encoder
+
+
+def is_loaded(model_name=MODEL_NAME):
+    return (model_name, _backend) in _models
+
+
+def warm_up(model_name=MODEL_NAME):
+    get_model(model_name).encode(["warm up"])
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
 
 def get_embedding(text):
-    return model.encode(text)
+    return get_encoder().encode(text)
+
+
+def render_service_metrics():
+    """Micro-batching queue and batch-size metrics for the encoders in use."""
+    return render_prometheus({
+        encoder_id(*key): encoder.service
+        for key, encoder in list(_encoders.items())
+        if encoder.service is not None
+    })
@@ -0,0 +1,203 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Texts per forward pass, and how long the first request in a batch may
+# wait for others to join it.
+MAX_BATCH_SIZE = int(os.environ.get("ENCODER_MAX_BATCH_SIZE", "32"))
+MAX_WAIT_MS = float(os.environ.get("ENCODER_MAX_WAIT_MS", "5"))
+# Longest a caller waits for its rows before giving up.
+RESULT_TIMEOUT = float(os.environ.get("ENCODER_RESULT_TIMEOUT", "60"))
+
+# Upper bounds of the batch-size histogram buckets.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class _Request:
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class EmbeddingService:
+    """Coalesce concurrent encode requests into batched forward passes.
+
+    Callers block in encode() while a dedicated thread collects requests
+    for up to max_wait_ms (or until max_batch_size texts are queued),
+    runs one encode over all of them and hands each caller its rows.
+    """
+
+    def __init__(self, encode, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS,
+                 result_timeout=RESULT_TIMEOUT):
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.result_timeout = result_timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.wait_seconds = 0.0
+        self.batch_sizes = {bound: 0 for bound in BATCH_SIZE_BUCKETS + (float("inf"),)}
+
+    def encode(self, texts):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        self._ensure_started()
+        request = _Request(texts)
+        self._queue.put(request)
+
+        with self._stats_lock:
+            self.requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+        try:
+            return request.future.result(timeout=self.result_timeout)
+        except TimeoutError:
+            # A cancelled request is skipped if the thread gets to it later.
+            request.future.cancel()
+            raise TimeoutError(
+                f"Encoding {len(texts)} texts took longer than {self.result_timeout}s"
+            )
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "texts": self.texts,
+                "batches": self.batches,
+                "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+                "batch_size_histogram": {
+                    str(bound): count for bound, count in self.batch_sizes.items()
+                },
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "mean_wait_ms": (
+                    self.wait_seconds / self.requests * 1000 if self.requests else 0.0
+                )
+            }
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-service", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        carried = None
+        while True:
+            batch = []
+            try:
+                first = carried or self._queue.get()
+                carried = None
+                batch.append(first)
+                size = len(first.texts)
+                deadline = first.enqueued_at + self.max_wait
+
+                while size < self.max_batch_size:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        if timeout > 0:
+                            request = self._queue.get(timeout=timeout)
+                        else:
+                            # Past the deadline: still take whatever is already queued.
+                            request = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if size + len(request.texts) > self.max_batch_size:
+                        carried = request
+                        break
+                    batch.append(request)
+                    size += len(request.texts)
+
+                self._run_batch(batch, size)
+            except Exception as e:
+                # Keep the thread alive: fail this batch and carry on.
+                logger.exception("Embedding service batch failed")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _run_batch(self, batch, size):
+        # Drop requests whose callers timed out and cancelled them.
+        live = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if len(live) != len(batch):
+            batch = live
+            size = sum(len(request.texts) for request in batch)
+            if not batch:
+                return
+
+        started = time.monotonic()
+        with self._stats_lock:
+            self.batches += 1
+            self.texts += size
+            self.wait_seconds += sum(started - request.enqueued_at for request in batch)
+            bound = next(b for b in self.batch_sizes if size <= b)
+            self.batch_sizes[bound] += 1
+
+        try:
+            vectors = np.asarray(
+                self._encode([text for request in batch for text in request.texts]),
+                dtype=np.float32
+            )
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            request.future.set_result(vectors[offset:offset + len(request.texts)])
+            offset += len(request.texts)
+
+
+def render_prometheus(services):
+    """Prometheus text for {label: EmbeddingService}: queue depth and batch sizes."""
+    if not services:
+        return ""
+    lines = [
+        "# HELP encoder_queue_depth Encode requests waiting for a batch.",
+        "# TYPE encoder_queue_depth gauge",
+    ]
+    stats = {label: service.stats() for label, service in sorted(services.items())}
+    for label, stat in stats.items():
+        lines.append(f'encoder_queue_depth{{encoder="{label}"}} {stat["queue_depth"]}')
+
+    lines += [
+        "# HELP encoder_max_queue_depth Deepest the encode queue has been.",
+        "# TYPE encoder_max_queue_depth gauge",
+    ]
+    for label, stat in stats.items():
+        lines.append(f'encoder_max_queue_depth{{encoder="{label}"}} {stat["max_queue_depth"]}')
+
+    lines += [
+        "# HELP encoder_batch_size Texts per micro-batched forward pass.",
+        "# TYPE encoder_batch_size histogram",
+    ]
+    for label, stat in stats.items():
+        cumulative = 0
+        for bound, count in stat["batch_size_histogram"].items():
+            cumulative += count
+            le = "+Inf" if bound == "inf" else bound
+            lines.append(f'encoder_batch_size_bucket{{encoder="{label}",le="{le}"}} {cumulative}')
+        lines.append(f'encoder_batch_size_sum{{encoder="{label}"}} {stat["texts"]}')
+        lines.append(f'encoder_batch_size_count{{encoder="{label}"}} {stat["batches"]}')
+    return "\n".join(lines) + "\n"
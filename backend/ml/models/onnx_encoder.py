@@ -0,0 +1,132 @@
+"""
+ONNX Runtime encoder with dynamic int8 quantization.
+
+The transformer is exported once to models/onnx/<model>/ and quantized
+with onnxruntime.quantization.quantize_dynamic; later loads reuse those
+files. OnnxEncoder.encode mirrors SentenceTransformer.encode for
+all-MiniLM-L6-v2: mean pooling over the attention mask followed by L2
+normalization.
+
+    cd backend && python -m ml.models.onnx_encoder   # export ahead of deploy
+"""
+import os
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ONNX_DIR = os.environ.get("ONNX_MODEL_DIR", os.path.join(BASE_DIR, "onnx"))
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+# all-MiniLM-L6-v2 is trained and served with 256-token inputs.
+MAX_SEQ_LENGTH = 256
+# 0 lets onnxruntime use every physical core.
+INTRA_OP_THREADS = int(os.environ.get("ONNX_INTRA_OP_THREADS", 0))
+
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+def model_dir(model_name):
+    return os.path.join(ONNX_DIR, model_name.replace("/", "__"))
+
+
+def export_model(model_name, output_dir=None):
+    """Export model_name to ONNX (fp32) and write a dynamic int8 copy beside it."""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_dir = output_dir or model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(output_dir)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, FP32_FILE)
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in INPUT_NAMES),
+            fp32_path,
+            input_names=INPUT_NAMES,
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                name: {0: "batch", 1: "sequence"}
+                for name in INPUT_NAMES + ["last_hidden_state"]
+            },
+            opset_version=17,
+            dynamo=False
+        )
+
+    quantize_dynamic(
+        fp32_path,
+        os.path.join(output_dir, INT8_FILE),
+        weight_type=QuantType.QInt8
+    )
+    return output_dir
+
+
+class OnnxEncoder:
+    """Sentence encoder with the same encode() interface as SentenceTransformer."""
+
+    def __init__(self, model_name, quantized=True, directory=None):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        directory = directory or model_dir(model_name)
+        path = os.path.join(directory, INT8_FILE if quantized else FP32_FILE)
+        if not os.path.exists(path):
+            export_model(model_name, directory)
+
+        options = onnxruntime.SessionOptions()
+        if INTRA_OP_THREADS:
+            options.intra_op_num_threads = INTRA_OP_THREADS
+
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.session = onnxruntime.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, sentences, batch_size=32, show_progress_bar=False, **kwargs):
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size=batch_size)[0]
+        if not len(sentences):
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Longest first, so each batch pads to a similar length.
+        order = np.argsort([-len(s) for s in sentences], kind="stable")
+        batches = []
+
+        for start in range(0, len(sentences), batch_size):
+            batch = [sentences[i] for i in order[start:start + batch_size]]
+            tokens = self.tokenizer(
+                batch,
+                padding=True,
+                truncation=True,
+                max_length=MAX_SEQ_LENGTH,
+                return_tensors="np"
+            )
+            feeds = {name: tokens[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled)
+
+        pooled = np.vstack(batches)
+        embeddings = np.empty_like(pooled)
+        embeddings[order] = pooled
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (embeddings / norms).astype(np.float32)
+
+
+if __name__ == "__main__":
+    from ml.models.embedding_model import MODEL_NAME
+
+    print("Exported ONNX model to", export_model(MODEL_NAME))
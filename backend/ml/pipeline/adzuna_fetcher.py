@@ -1,85 +1,252 @@
 import os
-import json
+import threading
 import requests
 import statistics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ml.pipeline.market_cache import get_market_cache
+from ml.pipeline.tracing import traced
 
 
 APP_ID = "cef42c56"
 APP_KEY = "1f2538acc20b1f2fe3b9f8dccfffd00d"
 COUNTRY = "in"
 
+# Override to point the fetcher at a local stub server.
+API_URL = os.environ.get("ADZUNA_API_URL", "https://api.adzuna.com/v1/api/jobs")
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-CACHE_PATH = os.path.join(BASE_DIR, "data", "market_cache.json")
 
+REQUEST_TIMEOUT = 10
+MAX_WORKERS = 8
+MAX_CONCURRENCY_PER_HOST = 4
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
 
-def load_cache():
-    if not os.path.exists(CACHE_PATH):
-        return {}
+_session = None
+_session_lock = threading.Lock()
+_host_limits = {}
 
-    with open(CACHE_PATH, "r") as f:
-        return json.load(f)
 
+def get_session():
+    global _session
 
-def save_cache(cache_data):
-    with open(CACHE_PATH, "w") as f:
-        json.dump(cache_data, f, indent=4)
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=BACKOFF_FACTOR,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=MAX_CONCURRENCY_PER_HOST,
+                pool_maxsize=MAX_WORKERS,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
 
+    return _session
+
+
+def host_limit(url):
+    host = urlparse(url).netloc
+
+    with _session_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(MAX_CONCURRENCY_PER_HOST)
+        return _host_limits[host]
 
-def fetch_market_data(job_title):
 
-    cache = load_cache()
+RESULTS_PER_PAGE = 100
+# Pages of postings fetched per title when ingesting jobs.
+MAX_PAGES = 5
 
-    if job_title in cache:
-        return cache[job_title]
 
+@traced("adzuna_request")
+def request_page(job_title, page=1):
+    """Fetch one page of Adzuna search results; returns None when the request failed."""
     if not APP_ID or not APP_KEY:
-        return default_response()
+        return None
 
-    url = f"https://api.adzuna.com/v1/api/jobs/{COUNTRY}/search/1"
+    url = f"{API_URL}/{COUNTRY}/search/{page}"
 
     params = {
         "app_id": APP_ID,
         "app_key": APP_KEY,
-        "results_per_page": 100,
+        "results_per_page": RESULTS_PER_PAGE,
         "what": job_title
     }
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        with host_limit(url):
+            response = get_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
 
         if response.status_code != 200:
-            return default_response()
+            return None
 
-        data = response.json()
+        return response.json()
 
-        jobs = data.get("results", [])
-        job_count = data.get("count", 0)
+    except (requests.RequestException, ValueError):
+        return None
 
-        salaries = []
-        for job in jobs:
-            salary_min = job.get("salary_min")
-            salary_max = job.get("salary_max")
 
-            if salary_min and salary_max:
-                salaries.append((salary_min + salary_max) / 2)
+def request_market_data(job_title):
+    """Query Adzuna for one title; returns None when the lookup failed."""
+    data = request_page(job_title)
+    if data is None:
+        return None
+    return summarize_results(data)
 
-        avg_salary = statistics.mean(salaries) if salaries else 0
 
-        market_score = normalize_market_score(job_count)
+def normalize_posting(job):
+    """Map an Adzuna result onto JobOpportunity fields; None if it has no id or url."""
+    if not job.get("id") or not job.get("redirect_url"):
+        return None
+
+    def integer(value):
+        return int(value) if value else None
+
+    return {
+        "external_id": f"adzuna:{job['id']}",
+        "title": (job.get("title") or "").strip()[:255],
+        "company": ((job.get("company") or {}).get("display_name") or "").strip()[:255],
+        "location": ((job.get("location") or {}).get("display_name") or "").strip()[:255],
+        "description": job.get("description") or "",
+        "salary_min": integer(job.get("salary_min")),
+        "salary_max": integer(job.get("salary_max")),
+        "url": job["redirect_url"][:1000],
+        "posted_date": job.get("created"),
+        "source": "adzuna"
+    }
+
 
-        result = {
-            "job_count": job_count,
-            "average_salary": round(avg_salary, 2),
-            "market_score": market_score
+def fetch_job_postings(job_title, max_pages=MAX_PAGES):
+    """Fetch up to max_pages of postings for one title.
+
+    Returns (postings, summary); summary is None when the first page failed,
+    otherwise the market summary computed over every fetched page.
+    """
+    first = request_page(job_title, 1)
+    if first is None:
+        return [], None
+
+    results = list(first.get("results", []))
+    total = first.get("count", 0)
+    pages = min(max_pages, -(-total // RESULTS_PER_PAGE))
+
+    for page in range(2, pages + 1):
+        data = request_page(job_title, page)
+        if not data or not data.get("results"):
+            break
+        results.extend(data["results"])
+
+    postings = [p for p in map(normalize_posting, results) if p is not None]
+    return postings, summarize_results({"count": total, "results": results})
+
+
+def crawl_titles(job_titles, max_pages=MAX_PAGES, max_workers=MAX_WORKERS):
+    """Fetch postings for many titles concurrently, yielding (title, postings) as each completes.
+
+    Each title's market summary is stored in the market cache on the way,
+    so an ingestion run also refreshes market data.
+    """
+    cache = get_market_cache()
+    titles = list(dict.fromkeys(job_titles))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(fetch_job_postings, title, max_pages): title
+            for title in titles
         }
+        for future in as_completed(futures):
+            title = futures[future]
+            postings, summary = future.result()
+            if summary is not None:
+                cache.store({title: summary})
+            yield title, postings
+
 
-        cache[job_title] = result
-        save_cache(cache)
+def summarize_results(data):
+    jobs = data.get("results", [])
+    job_count = data.get("count", 0)
 
-        return result
+    salaries = []
+    for job in jobs:
+        salary_min = job.get("salary_min")
+        salary_max = job.get("salary_max")
 
-    except:
-        return default_response()
+        if salary_min and salary_max:
+            salaries.append((salary_min + salary_max) / 2)
+
+    avg_salary = statistics.mean(salaries) if salaries else 0
+
+    market_score = normalize_market_score(job_count)
+
+    return {
+        "job_count": job_count,
+        "average_salary": round(avg_salary, 2),
+        "market_score": market_score
+    }
+
+
+def fetch_market_data(job_title):
+    return fetch_market_data_batch([job_title])[job_title]
+
+
+def fetch_titles(job_titles, max_workers=MAX_WORKERS):
+    """Query Adzuna for several titles concurrently; failed lookups are left out."""
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for title, result in zip(job_titles, executor.map(request_market_data, job_titles)):
+            if result is not None:
+                fetched[title] = result
+    return fetched
+
+
+@traced("fetch_market_data")
+def fetch_market_data_batch(job_titles, max_workers=MAX_WORKERS, refresh=False, wait=True):
+    """Look up many titles at once.
+
+    Cached values are returned even when stale or expired, and those titles
+    are refreshed in the background. Titles with no cached value are fetched
+    concurrently before returning; with wait=False they are queued for the
+    background refresh too and reported with default values meanwhile.
+    refresh=True refetches every title before returning.
+    """
+    cache = get_market_cache()
+    titles = list(dict.fromkeys(job_titles))
+
+    values, stale, expired = cache.lookup(titles)
+    values.update(expired)
+
+    if refresh:
+        fetched = fetch_titles(titles, max_workers)
+        cache.store(fetched)
+        values.update(fetched)
+    else:
+        outdated = stale + list(expired)
+        missing = [t for t in titles if t not in values]
+        if missing and wait:
+            fetched = fetch_titles(missing, max_workers)
+            cache.store(fetched)
+            values.update(fetched)
+        else:
+            outdated += missing
+        if outdated:
+            cache.revalidate(outdated, fetch_titles)
+
+    return {
+        title: values.get(title) or default_response()
+        for title in titles
+    }
 
 
 def normalize_market_score(job_count):
@@ -0,0 +1,142 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ml.models.embedding_model import encoder_id, get_encoder
+from ml.pipeline.resume_parser import parse_resume
+from ml.pipeline.profile_index import get_profile_index
+from ml.pipeline.skill_embeddings import get_skill_store, add_missing_skills, normalize_rows
+from ml.pipeline.recommendation_engine import (
+    build_resume_profile,
+    rank_careers,
+    profile_skills,
+    DEFAULT_POLICY,
+    MIN_SCORE,
+)
+from ml.pipeline.market_table import get_market_table
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+# Resumes parsed and scored together; results are yielded after each chunk.
+CHUNK_SIZE = 256
+# Batch size handed to model.encode within a chunk.
+ENCODE_BATCH_SIZE = 64
+
+
+def find_resumes(directory):
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def parse_one(path):
+    try:
+        return path, parse_resume(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def embed_parsed_resumes(parsed_resumes, batch_size=ENCODE_BATCH_SIZE):
+    if not parsed_resumes:
+        return np.zeros((0, 0), dtype=np.float32)
+    texts = [build_resume_profile(parsed) for parsed in parsed_resumes]
+    return np.asarray(get_encoder().encode(texts, batch_size=batch_size), dtype=np.float32)
+
+
+def recommend_careers_batch(parsed_resumes, batch_size=ENCODE_BATCH_SIZE,
+                            top_k=None, min_score=MIN_SCORE, policy=DEFAULT_POLICY):
+    if not parsed_resumes:
+        return []
+
+    embeddings = embed_parsed_resumes(parsed_resumes, batch_size)
+    return score_embeddings(parsed_resumes, embeddings, top_k, min_score, policy)
+
+
+def score_embeddings(parsed_resumes, embeddings, top_k=None, min_score=MIN_SCORE,
+                     policy=DEFAULT_POLICY):
+    """Rank careers for resumes whose embeddings are already known (one row each)."""
+    if not parsed_resumes:
+        return []
+
+    index = get_profile_index()
+    model = get_encoder()
+
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    resume_vectors = normalize_rows(embeddings)
+
+    # One matrix product each for profile and skill similarity of every resume.
+    similarities = resume_vectors @ index.embeddings.T
+
+    store = get_skill_store(model, encoder_id())
+    store = add_missing_skills(store, model, profile_skills(index.profiles))
+    skill_similarities = resume_vectors @ store["embeddings"].T
+
+    market = get_market_table(index)
+
+    return [
+        rank_careers(
+            parsed,
+            embeddings[i],
+            similarities=similarities[i],
+            skill_scores=(store["index"], skill_similarities[i]),
+            market=market,
+            top_k=top_k,
+            min_score=min_score,
+            policy=policy
+        )
+        for i, parsed in enumerate(parsed_resumes)
+    ]
+
+
+def analyze_resumes(paths, workers=None, chunk_size=CHUNK_SIZE, batch_size=ENCODE_BATCH_SIZE,
+                    executor=None):
+    """Parse resumes on a process pool and score them in batches.
+
+    Yields one dict per path, in input order: either
+    {"file", "parsed_resume", "recommendations", "embedding"} or
+    {"file", "error"}. Parsing runs on executor when one is given (it is
+    left running), otherwise on a pool of `workers` processes created for
+    this call.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+
+    if executor is not None:
+        yield from _analyze_chunks(paths, executor, chunk_size, batch_size)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        yield from _analyze_chunks(paths, executor, chunk_size, batch_size)
+
+
+def _analyze_chunks(paths, executor, chunk_size, batch_size):
+    for start in range(0, len(paths), chunk_size):
+        parsed = list(executor.map(parse_one, paths[start:start + chunk_size]))
+
+        succeeded = [(i, result) for i, (_, result, error) in enumerate(parsed) if error is None]
+        parsed_resumes = [result for _, result in succeeded]
+        embeddings = embed_parsed_resumes(parsed_resumes, batch_size)
+        recommendations = score_embeddings(parsed_resumes, embeddings)
+        by_position = {
+            i: (recs, embedding)
+            for (i, _), recs, embedding in zip(succeeded, recommendations, embeddings)
+        }
+
+        for i, (path, parsed_resume, error) in enumerate(parsed):
+            if error is not None:
+                yield {"file": path, "error": error}
+            else:
+                recs, embedding = by_position[i]
+                yield {
+                    "file": path,
+                    "parsed_resume": parsed_resume,
+                    "recommendations": recs,
+                    "embedding": embedding
+                }
@@ -1,66 +1,45 @@
-import pickle
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-
-
-MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
-EMBEDDING_FILE = "models/profile_embeddings.pkl"
-
-model = SentenceTransformer(MODEL_NAME)
-
-
-def load_profiles():
-    with open(EMBEDDING_FILE, "rb") as f:
-        data = pickle.load(f)
-    return data["profiles"], data["embeddings"]
-
-
-def build_resume_profile(parsed_resume):
-    combined = (
-        "Degree: " + str(parsed_resume.get("degree", "")) + " " +
-        "Experience: " + str(parsed_resume.get("experience_years", "")) + " years " +
-        "Technical Skills: " + " ".join(parsed_resume.get("technical_skills", [])) + " " +
-        "Soft Skills: " + " ".join(parsed_resume.get("soft_skills", [])) + " " +
-        parsed_resume.get("raw_text", "")
-    )
-    return combined.strip()
+from ml.models.embedding_model import encoder_id, get_encoder
+from ml.pipeline.profile_index import get_profile_index
+from ml.pipeline.recommendation_engine import embed_resume
+from ml.pipeline.tracing import traced
+from ml.pipeline.skill_embeddings import (
+    get_skill_store,
+    add_missing_skills,
+    skill_similarities,
+)
 
 
 def semantic_skill_match(resume_embedding, skills, threshold=0.35):
+    model = get_encoder()
+    store = get_skill_store(model, encoder_id())
+    store = add_missing_skills(store, model, skills)
+    similarities = skill_similarities(resume_embedding, store)
+
     matched = []
     for skill in skills:
-        skill_embedding = model.encode([skill])[0]
-        similarity = cosine_similarity(
-            [resume_embedding],
-            [skill_embedding]
-        )[0][0]
+        similarity = similarities[store["index"][skill]]
         if similarity >= threshold:
             matched.append(skill)
     return matched
 
 
-def build_dashboard_summary(parsed_resume, top_k=5):
+@traced("build_dashboard_summary")
+def build_dashboard_summary(parsed_resume, top_k=5, resume_embedding=None):
+    """Dashboard figures for a resume; pass a stored resume_embedding to skip encoding."""
+    index = get_profile_index()
+    profiles = index.profiles
 
-    profiles, profile_embeddings = load_profiles()
+    if resume_embedding is None:
+        resume_embedding = embed_resume(parsed_resume)
 
-    resume_text = build_resume_profile(parsed_resume)
-    resume_embedding = model.encode([resume_text])[0]
+    similarities = index.similarities(resume_embedding)
 
-    similarities = cosine_similarity(
-        [resume_embedding],
-        profile_embeddings
-    )[0]
+    job_matches = int(np.count_nonzero(similarities.astype(np.float64) * 100 > 20))
 
-    ranked_indices = np.argsort(similarities)[::-1]
-
-    job_matches = 0
-    for idx in ranked_indices:
-        match_percentage = float(similarities[idx]) * 100
-        if match_percentage > 20:
-            job_matches += 1
-
-    top_indices = ranked_indices[:top_k]
+    top_k = min(top_k, len(similarities))
+    top_indices = np.argpartition(-similarities, top_k - 1)[:top_k]
+    top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
     top_similarities = similarities[top_indices]
 
     top_jobs = []
@@ -110,9 +89,8 @@ def build_dashboard_summary(parsed_resume, top_k=5):
         (best_similarity * 0.7 + skill_match_ratio * 0.3) * 100
     )
 
-    skill_gaps = list(
-        set(best_profile.get("skills", [])) - set(matched_skills)
-    )
+    matched = set(matched_skills)
+    skill_gaps = [s for s in best_profile.get("skills", []) if s not in matched]
 
     return {
         "resume_score": resume_score,
@@ -124,4 +102,4 @@ def build_dashboard_summary(parsed_resume, top_k=5):
         "job_match_strength": job_match_strength,
         "top_jobs": top_jobs,
         "skill_gaps": skill_gaps[:5]
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_PATH = os.path.join(BASE_DIR, "data", "market_cache.json")
+SQLITE_PATH = os.environ.get(
+    "MARKET_CACHE_PATH",
+    os.path.join(BASE_DIR, "data", "market_cache.sqlite3")
+)
+
+# "sqlite" (default) or "django" to store entries in the Django cache alias
+# named by MARKET_CACHE_ALIAS.
+BACKEND = os.environ.get("MARKET_CACHE_BACKEND", "sqlite")
+DJANGO_ALIAS = os.environ.get("MARKET_CACHE_ALIAS", "market")
+
+# Entries younger than TTL are fresh. Older entries are still served for
+# STALE_TTL more seconds while a background refresh runs; after that they
+# are expired and kept only as a last known value.
+TTL = int(os.environ.get("MARKET_CACHE_TTL", str(24 * 3600)))
+STALE_TTL = int(os.environ.get("MARKET_CACHE_STALE_TTL", str(7 * 24 * 3600)))
+LRU_SIZE = 1024
+
+
+class SQLiteBackend:
+    """Durable store shared by every worker on the host.
+
+    WAL mode lets readers run alongside a writer, and each write is a
+    single transaction, so concurrent workers never see a partial file.
+    """
+
+    def __init__(self, path=SQLITE_PATH, seed_path=SEED_PATH):
+        self.path = path
+        self.seed_path = seed_path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._ready = False
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        if not self._ready:
+            self._setup(conn)
+        return conn
+
+    def _setup(self, conn):
+        with self._init_lock:
+            if self._ready:
+                return
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS market_data ("
+                    "title TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                    "fetched_at REAL NOT NULL)"
+                )
+            self._seed(conn)
+            self._ready = True
+
+    def _seed(self, conn):
+        # Import the legacy JSON cache once so existing data is not refetched.
+        if not self.seed_path or not os.path.exists(self.seed_path):
+            return
+        if conn.execute("SELECT 1 FROM market_data LIMIT 1").fetchone():
+            return
+
+        with open(self.seed_path, "r") as f:
+            seed = json.load(f)
+        fetched_at = os.path.getmtime(self.seed_path)
+
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO market_data VALUES (?, ?, ?)",
+                [(title, json.dumps(data), fetched_at) for title, data in seed.items()]
+            )
+
+    def get_many(self, titles):
+        titles = list(titles)
+        found = {}
+        conn = self._connection()
+        # Stay well below SQLite's bound-parameter limit.
+        for start in range(0, len(titles), 500):
+            chunk = titles[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT title, payload, fetched_at FROM market_data WHERE title IN ({placeholders})",
+                chunk
+            )
+            for title, payload, fetched_at in rows:
+                found[title] = (json.loads(payload), fetched_at)
+        return found
+
+    def set_many(self, entries):
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO market_data VALUES (?, ?, ?)",
+                [(title, json.dumps(data), fetched_at) for title, (data, fetched_at) in entries.items()]
+            )
+
+
+class DjangoCacheBackend:
+    """Store entries in a Django cache alias.
+
+    Only as durable and as widely shared as the alias: use a file, Redis or
+    Memcached cache, not LocMemCache.
+    """
+
+    key_prefix = "market:"
+
+    def __init__(self, alias=DJANGO_ALIAS):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+
+    def get_many(self, titles):
+        keys = {self.key_prefix + title: title for title in titles}
+        return {
+            keys[key]: value
+            for key, value in self.cache.get_many(list(keys)).items()
+        }
+
+    def set_many(self, entries):
+        self.cache.set_many(
+            {self.key_prefix + title: entry for title, entry in entries.items()},
+            # Expired entries are still served as the last known value.
+            timeout=None
+        )
+
+
+class MarketCache:
+    """In-process LRU in front of a durable backend, with TTL and stale-while-revalidate."""
+
+    def __init__(self, backend, ttl=TTL, stale_ttl=STALE_TTL, lru_size=LRU_SIZE):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresher = None
+
+    def _remember(self, title, entry):
+        self._lru[title] = entry
+        self._lru.move_to_end(title)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def lookup(self, titles):
+        """Return (values, stale, expired) for the given titles.
+
+        values holds entries within TTL + STALE_TTL; stale lists the ones
+        among them older than TTL; expired maps titles past the stale
+        window to their last known value. Both need revalidation.
+        """
+        now = time.time()
+        entries = {}
+        misses = []
+
+        with self._lock:
+            for title in titles:
+                entry = self._lru.get(title)
+                if entry is None:
+                    misses.append(title)
+                else:
+                    self._lru.move_to_end(title)
+                    entries[title] = entry
+
+        if misses:
+            loaded = self.backend.get_many(misses)
+            with self._lock:
+                for title, entry in loaded.items():
+                    self._remember(title, entry)
+            entries.update(loaded)
+
+        values, stale, expired = {}, [], {}
+        for title, (data, fetched_at) in entries.items():
+            age = now - fetched_at
+            if age <= self.ttl:
+                values[title] = data
+            elif age <= self.ttl + self.stale_ttl:
+                values[title] = data
+                stale.append(title)
+            else:
+                expired[title] = data
+
+        return values, stale, expired
+
+    def store(self, results):
+        if not results:
+            return
+        now = time.time()
+        entries = {title: (data, now) for title, data in results.items()}
+        self.backend.set_many(entries)
+        with self._lock:
+            for title, entry in entries.items():
+                self._remember(title, entry)
+
+    def revalidate(self, titles, fetch):
+        """Refresh stale titles in the background, once per title at a time."""
+        with self._lock:
+            pending = [t for t in titles if t not in self._refreshing]
+            self._refreshing.update(pending)
+            if pending and self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="market-refresh")
+        if not pending:
+            return
+
+        def refresh():
+            try:
+                # Another worker may already have refreshed the shared store.
+                now = time.time()
+                current = self.backend.get_many(pending)
+                fresh = {t: e for t, e in current.items() if now - e[1] <= self.ttl}
+                with self._lock:
+                    for title, entry in fresh.items():
+                        self._remember(title, entry)
+
+                outdated = [t for t in pending if t not in fresh]
+                if outdated:
+                    self.store(fetch(outdated))
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(pending)
+
+        self._refresher.submit(refresh)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_market_cache():
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            backend = DjangoCacheBackend() if BACKEND == "django" else SQLiteBackend()
+            _cache = MarketCache(backend)
+
+    return _cache
@@ -0,0 +1,57 @@
+import os
+import time
+import threading
+import numpy as np
+from ml.pipeline.adzuna_fetcher import fetch_market_data_batch
+from ml.pipeline.profile_index import get_profile_index
+
+# Market data only changes when the market cache refreshes, so the table
+# is rebuilt from it at most this often (and whenever the index reloads).
+TTL = int(os.environ.get("MARKET_TABLE_TTL", "300"))
+
+
+class MarketTable:
+    """Market data as arrays aligned with the profile index order."""
+
+    def __init__(self, titles, entries, index_mtime):
+        self.titles = titles
+        self.entries = entries
+        self.index_mtime = index_mtime
+        self.built_at = time.time()
+
+        self.job_count = np.array([e.get("job_count", 0) for e in entries], dtype=np.int64)
+        self.average_salary = np.array([e.get("average_salary", 0) for e in entries], dtype=np.float64)
+        self.market_score = np.array([e.get("market_score", 0) for e in entries], dtype=np.float64)
+
+    @classmethod
+    def build(cls, index):
+        # Never waits on Adzuna: titles without cached data score as empty
+        # markets until the background refresh stores them, and the next
+        # rebuild picks them up.
+        titles = [profile["career_title"] for profile in index.profiles]
+        lookup = fetch_market_data_batch(titles, wait=False)
+        return cls(titles, [lookup[title] for title in titles], index.mtime)
+
+    def is_current(self, index):
+        return self.index_mtime == index.mtime and time.time() - self.built_at < TTL
+
+    def __len__(self):
+        return len(self.titles)
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_market_table(index=None):
+    global _table
+
+    index = index or get_profile_index()
+    table = _table
+    if table is not None and table.is_current(index):
+        return table
+
+    with _table_lock:
+        if _table is None or not _table.is_current(index):
+            _table = MarketTable.build(index)
+        return _table
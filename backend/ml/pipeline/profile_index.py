@@ -0,0 +1,109 @@
+import os
+import json
+import pickle
+import threading
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMBEDDING_FILE = os.path.join(BASE_DIR, "models", "profile_embeddings.pkl")
+
+# Set PROFILE_INDEX_MMAP=1 to serve the normalized matrix from a .npy file
+# mapped read-only, so every worker on the box shares the same pages.
+USE_MMAP = os.environ.get("PROFILE_INDEX_MMAP", "0") == "1"
+
+
+class ProfileIndex:
+    """Career profiles plus their L2-normalized embedding matrix.
+
+    An instance never changes after load(); get_profile_index swaps in a
+    new one when the pickle changes, so a caller holding an index always
+    sees profiles and embeddings from the same file.
+    """
+
+    def __init__(self, profiles, embeddings, mtime=None):
+        self.profiles = profiles
+        self.embeddings = embeddings
+        self.mtime = mtime
+
+    @classmethod
+    def load(cls, embedding_file=EMBEDDING_FILE, mmap=USE_MMAP):
+        # Stat before reading, so a pickle replaced meanwhile looks stale.
+        stat = os.stat(embedding_file)
+        mtime = stat.st_mtime
+        with open(embedding_file, "rb") as f:
+            data = pickle.load(f)
+
+        embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        embeddings = np.ascontiguousarray(embeddings / norms)
+
+        if mmap:
+            stamp = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            embeddings = mapped_matrix(embeddings, embedding_file, stamp)
+
+        return cls(data["profiles"], embeddings, mtime)
+
+    def similarities(self, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        return self.embeddings @ vector
+
+    def __len__(self):
+        return len(self.profiles)
+
+
+def replace_file(path, write):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        write(f)
+    os.replace(temp_path, path)
+
+
+def mapped_matrix(embeddings, embedding_file, stamp):
+    """Write embeddings next to embedding_file as .npy (if stale) and map it read-only.
+
+    stamp is the pickle's mtime and size. A .source.json sidecar records the
+    stamp the matrix was built from, and any difference rewrites it. That
+    includes an older pickle restored in place.
+    """
+    base = os.path.splitext(embedding_file)[0]
+    matrix_file = base + ".npy"
+    source_file = base + ".source.json"
+
+    try:
+        with open(source_file, "r") as f:
+            current = json.load(f) == stamp
+        matrix = np.load(matrix_file, mmap_mode="r") if current else None
+    except (OSError, ValueError):
+        matrix = None
+
+    if matrix is None or matrix.shape != embeddings.shape:
+        # Matrix first, then the stamp: a reader that sees the new stamp
+        # also sees the new matrix.
+        replace_file(matrix_file, lambda f: np.save(f, embeddings))
+        replace_file(source_file, lambda f: f.write(json.dumps(stamp).encode()))
+        matrix = np.load(matrix_file, mmap_mode="r")
+
+    return matrix
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_profile_index():
+    """The current ProfileIndex, reloaded when the pickle's mtime has changed."""
+    global _index
+
+    mtime = os.path.getmtime(EMBEDDING_FILE)
+    index = _index
+    if index is not None and index.mtime == mtime:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.mtime != mtime:
+            _index = ProfileIndex.load()
+        return _index
@@ -1,22 +1,28 @@
-import pickle
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from ml.pipeline.resume_parser import parse_resume
-from ml.pipeline.adzuna_fetcher import fetch_market_data
-
-MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 import os
+import numpy as np
+from ml.models.embedding_model import encoder_id, get_encoder
+from ml.pipeline.resume_parser import parse_resume, parser_version
+from ml.pipeline.market_table import get_market_table
+from ml.pipeline.profile_index import EMBEDDING_FILE, get_profile_index
+from ml.pipeline.tracing import traced
+from ml.pipeline.skill_embeddings import (
+    get_skill_store,
+    add_missing_skills,
+    skill_similarities,
+)
+
+# Recommendations scoring at or below this final score are dropped.
+MIN_SCORE = 20
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-EMBEDDING_FILE = os.path.join(BASE_DIR, "models", "profile_embeddings.pkl")
+def load_profiles():
+    index = get_profile_index()
+    return index.profiles, index.embeddings
 
-model = SentenceTransformer(MODEL_NAME)
 
-def load_profiles():
-    with open(EMBEDDING_FILE, "rb") as f:
-        data = pickle.load(f)
-    return data["profiles"], data["embeddings"]
+def pipeline_version():
+    """Identifies the model, profile index and skill data behind a recommendation."""
+    stat = os.stat(EMBEDDING_FILE)
+    return (encoder_id(), stat.st_mtime, stat.st_size) + parser_version()
 
 
 def flatten_skills(skill_data):
@@ -41,18 +47,25 @@ def build_resume_profile(parsed_resume):
 
     return combined.strip().lower()
 
-def calculate_skill_gap(resume_embedding, career_profile, threshold=0.35):
+def score_skills(resume_embedding, skills=()):
+    model = get_encoder()
+    store = get_skill_store(model, encoder_id())
+    store = add_missing_skills(store, model, skills)
+    return store["index"], skill_similarities(resume_embedding, store)
+
+
+def calculate_skill_gap(resume_embedding, career_profile, threshold=0.35, skill_scores=None):
 
     matched = []
     missing = []
 
-    for skill in career_profile.get("skills", []):
-        skill_embedding = model.encode([skill])[0]
+    skills = career_profile.get("skills", [])
+    if skill_scores is None:
+        skill_scores = score_skills(resume_embedding, skills)
+    skill_index, similarities = skill_scores
 
-        similarity = cosine_similarity(
-            [resume_embedding],
-            [skill_embedding]
-        )[0][0]
+    for skill in skills:
+        similarity = similarities[skill_index[skill]]
 
         if similarity >= threshold:
             matched.append(skill)
@@ -71,48 +84,127 @@ def get_dynamic_weights(experience_years):
     else:
         return 0.8, 0.2
 
-def recommend_careers(parsed_resume, top_k=5):
 
-    profiles, profile_embeddings = load_profiles()
+# Weighting policies map experience years to (semantic_weight, market_weight).
+# "dynamic" is the production policy; others exist for A/B comparisons.
+WEIGHT_POLICIES = {
+    "dynamic": get_dynamic_weights,
+    "semantic_only": lambda experience_years: (1.0, 0.0),
+}
+DEFAULT_POLICY = "dynamic"
 
-    resume_text = build_resume_profile(parsed_resume)
-    resume_embedding = model.encode([resume_text])[0]
 
-    similarities = cosine_similarity(
-        [resume_embedding],
-        profile_embeddings
-    )[0]
+def policy_weights(experience_years, policies):
+    """(semantic, market) weight columns with one row per policy."""
+    weights = np.array(
+        [WEIGHT_POLICIES[policy](experience_years) for policy in policies],
+        dtype=np.float64
+    )
+    return weights[:, :1], weights[:, 1:]
 
-    ranked_indices = np.argsort(similarities)[::-1]
 
-    experience = parsed_resume.get("experience_years", 0)
-    semantic_weight, market_weight = get_dynamic_weights(experience)
+def policy_scores(semantic_scores, market_scores, experience_years, policies=(DEFAULT_POLICY,)):
+    """Final scores for every profile under each policy, shape (len(policies), n_profiles)."""
+    semantic_weights, market_weights = policy_weights(experience_years, policies)
+    return semantic_weights * semantic_scores + market_weights * market_scores
 
-    results = []
 
-    for idx in ranked_indices:
+def profile_skills(profiles):
+    return [skill for profile in profiles for skill in profile.get("skills", [])]
 
-        profile = profiles[idx]
-        semantic_score = float(similarities[idx]) * 100
 
-        market_data = fetch_market_data(profile["career_title"])
-        market_score = market_data.get("market_score", 0)
+def select_top(final_scores, tiebreak, top_k=None, min_score=MIN_SCORE):
+    """Indices of scores above min_score, best first, limited to top_k.
+
+    Ties on the final score are broken by tiebreak (higher first), then
+    by profile order, so the ranking is deterministic.
+    """
+    candidates = np.flatnonzero(final_scores > min_score)
+
+    if top_k is not None and len(candidates) > top_k:
+        if top_k <= 0:
+            return candidates[:0]
+        part = np.argpartition(-final_scores[candidates], top_k - 1)[:top_k]
+        cutoff = final_scores[candidates[part]].min()
+        # Keep everything tied with the k-th score so the tiebreak decides.
+        candidates = candidates[final_scores[candidates] >= cutoff]
+
+    order = np.lexsort((candidates, -tiebreak[candidates], -final_scores[candidates]))
+    return candidates[order][:top_k]
+
+
+def embed_resume(parsed_resume):
+    return get_encoder().encode([build_resume_profile(parsed_resume)])[0]
+
+
+def recommend_careers(parsed_resume, top_k=None, min_score=MIN_SCORE, policy=DEFAULT_POLICY):
+    return rank_careers(
+        parsed_resume,
+        embed_resume(parsed_resume),
+        top_k=top_k,
+        min_score=min_score,
+        policy=policy
+    )
+
+
+@traced("rank_careers")
+def rank_careers(parsed_resume, resume_embedding, similarities=None,
+                 skill_scores=None, market=None, top_k=None, min_score=MIN_SCORE,
+                 policy=DEFAULT_POLICY):
+    """Rank profiles for one embedded resume.
+
+    Final scores are computed for every profile at once; skill gaps and
+    result payloads are only built for the top_k profiles scoring above
+    min_score. Batch callers pass similarities, skill_scores and the
+    market table that were computed for many resumes at once.
+    """
+    index = get_profile_index()
+    profiles = index.profiles
+
+    if similarities is None:
+        similarities = index.similarities(resume_embedding)
+
+    if market is None:
+        market = get_market_table(index)
+
+    experience = parsed_resume.get("experience_years", 0)
+    semantic_weight, market_weight = WEIGHT_POLICIES[policy](experience)
+
+    semantic_scores = np.asarray(similarities, dtype=np.float64) * 100
+    final_scores = policy_scores(
+        semantic_scores, market.market_score, experience, (policy,)
+    )[0]
+
+    selected = select_top(
+        np.round(final_scores, 2), semantic_scores, top_k=top_k, min_score=min_score
+    )
+    if not len(selected):
+        return []
 
-        final_score = (
-            semantic_score * semantic_weight +
-            market_score * market_weight
+    if skill_scores is None:
+        skill_scores = score_skills(
+            resume_embedding,
+            profile_skills([profiles[idx] for idx in selected])
         )
 
+    results = []
+
+    for idx in selected:
+
+        profile = profiles[idx]
+        market_data = market.entries[idx]
+
         matched_skills, missing_skills = calculate_skill_gap(
             resume_embedding,
-            profile
+            profile,
+            skill_scores=skill_scores
         )
 
         results.append({
             "career_title": profile["career_title"],
-            "semantic_score": round(semantic_score, 2),
-            "market_score": market_score,
-            "final_score": round(final_score, 2),
+            "semantic_score": round(float(semantic_scores[idx]), 2),
+            "market_score": market_data.get("market_score", 0),
+            "final_score": round(float(final_scores[idx]), 2),
             "semantic_weight": semantic_weight,
             "market_weight": market_weight,
             "job_count": market_data.get("job_count", 0),
@@ -121,12 +213,9 @@ def recommend_careers(parsed_resume, top_k=5):
             "missing_skills": missing_skills[:5]
         })
 
-    results = sorted(results, key=lambda x: x["final_score"], reverse=True)
-
-    results = [r for r in results if r["final_score"] > 20]
-
     return results
 
+
 if __name__ == "__main__":
 
     resume_path = "data/sample_resume.pdf"
@@ -1,63 +1,213 @@
-import pdfplumber
-import docx
-import pandas as pd
 import re
 import os
+import csv
 import json
-from pdf2image import convert_from_path
-import pytesseract
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from ml.pipeline.tracing import stage, traced
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DEGREE_DB_PATH = os.path.join(BASE_DIR, "data", "degrees.csv")
 TECH_SKILLS_PATH = os.path.join(BASE_DIR, "data", "tech_skills.json")
 
-def extract_text_from_pdf(file_path):
-    text = ""
+MAX_PDF_PAGES = int(os.environ.get("RESUME_MAX_PAGES", 10))
+MAX_PDF_BYTES = int(os.environ.get("RESUME_MAX_BYTES", 10 * 1024 * 1024))
+OCR_DPI = int(os.environ.get("RESUME_OCR_DPI", 200))
+# 0 or 1 extracts pages serially; higher values use a process pool.
+PDF_WORKERS = int(os.environ.get("RESUME_PDF_WORKERS", 0))
+# Set RESUME_PDF_EARLY_EXIT=1 to stop reading pages once the skills,
+# experience and education sections have all been seen.
+EARLY_EXIT = os.environ.get("RESUME_PDF_EARLY_EXIT", "0") == "1"
+
+SKILLS_SECTION_PATTERN = re.compile(
+    r'skills(.*?)(projects|education|experience)',
+    re.DOTALL
+)
+REQUIRED_SECTIONS = ("skills", "experience", "education")
+
+# One pool per requested size, created on first use and kept for the
+# life of the process (normally just RESUME_PDF_WORKERS).
+_pdf_executors = {}
+_pdf_executor_lock = threading.Lock()
+
+def get_pdf_executor(workers):
+    with _pdf_executor_lock:
+        executor = _pdf_executors.get(workers)
+        if executor is None:
+            executor = _pdf_executors[workers] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return executor
+
+def has_required_sections(text):
+    text = text.lower()
+    return (
+        all(section in text for section in REQUIRED_SECTIONS) and
+        SKILLS_SECTION_PATTERN.search(text) is not None
+    )
 
+def count_pdf_pages(file_path):
     try:
+        import pdfplumber
+
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
+            return len(pdf.pages)
+    except Exception:
+        from pdf2image import pdfinfo_from_path
+
+        return int(pdfinfo_from_path(file_path).get("Pages", 0))
+
+def extract_pdf_page_text(file_path, page_number):
+    import pdfplumber
+
+    with pdfplumber.open(file_path, pages=[page_number + 1]) as pdf:
+        return pdf.pages[0].extract_text() or ""
+
+def extract_pdf_text_serial(file_path, max_pages, early_exit):
+    import pdfplumber
+
+    parts = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[:max_pages]:
+            parts.append(page.extract_text() or "")
+            if early_exit and has_required_sections("".join(parts)):
+                break
+    return "".join(parts)
+
+def ocr_pdf_page(file_path, page_number, dpi=OCR_DPI):
+    from pdf2image import convert_from_path
+    import pytesseract
+
+    images = convert_from_path(
+        file_path,
+        dpi=dpi,
+        first_page=page_number + 1,
+        last_page=page_number + 1
+    )
+    return "".join(pytesseract.image_to_string(img) for img in images)
+
+def extract_pages(page_function, file_path, page_count, workers, early_exit, *args):
+    parts = []
+
+    if workers <= 1:
+        for page_number in range(page_count):
+            parts.append(page_function(file_path, page_number, *args))
+            if early_exit and has_required_sections("".join(parts)):
+                break
+        return "".join(parts)
+
+    executor = get_pdf_executor(workers)
+    for start in range(0, page_count, workers):
+        pages = range(start, min(start + workers, page_count))
+        parts.extend(executor.map(
+            page_function,
+            [file_path] * len(pages),
+            pages,
+            *([arg] * len(pages) for arg in args)
+        ))
+        if early_exit and has_required_sections("".join(parts)):
+            break
+
+    return "".join(parts)
+
+@traced("extract_text_from_pdf")
+def extract_text_from_pdf(file_path, workers=None, max_pages=None, ocr_dpi=None, early_exit=EARLY_EXIT):
+    workers = PDF_WORKERS if workers is None else workers
+    max_pages = MAX_PDF_PAGES if max_pages is None else max_pages
+    ocr_dpi = OCR_DPI if ocr_dpi is None else ocr_dpi
+
+    if os.path.getsize(file_path) > MAX_PDF_BYTES:
+        raise ValueError(f"Resume exceeds the {MAX_PDF_BYTES // (1024 * 1024)} MB limit")
+
+    text = ""
+
+    try:
+        with stage("pdf_text"):
+            if workers <= 1:
+                text = extract_pdf_text_serial(file_path, max_pages, early_exit)
+            else:
+                page_count = min(count_pdf_pages(file_path), max_pages)
+                text = extract_pages(extract_pdf_page_text, file_path, page_count, workers, early_exit)
     except Exception:
         pass
 
     if text.strip() == "":
-        images = convert_from_path(file_path)
-        for img in images:
-            text += pytesseract.image_to_string(img)
+        with stage("ocr"):
+            page_count = min(count_pdf_pages(file_path), max_pages)
+            text = extract_pages(ocr_pdf_page, file_path, page_count, workers, early_exit, ocr_dpi)
 
     return text.lower()
 
+@traced("extract_text_from_docx")
 def extract_text_from_docx(file_path):
+    import docx
+
     doc = docx.Document(file_path)
     text = "\n".join(p.text for p in doc.paragraphs)
     return text.lower()
 
+@traced("extract_resume_text")
 def extract_resume_text(file_path):
-    if file_path.endswith(".pdf"):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".pdf":
         return extract_text_from_pdf(file_path)
-    elif file_path.endswith(".docx"):
+    elif extension == ".docx":
         return extract_text_from_docx(file_path)
     return ""
 
+# Checked after every row of degrees.csv, in this order.
+DEGREE_FALLBACKS = [
+    ("b.tech", "bachelor of technology", "technology"),
+    ("btech", "bachelor of technology", "technology"),
+    ("b.e", "bachelor of engineering", "technology"),
+]
+
+_degree_table = None
+
+def load_degree_table():
+    entries = []
+
+    with open(DEGREE_DB_PATH, newline="") as f:
+        for row in csv.DictReader(f):
+            degree_name = str(row["degree"]).lower()
+            domain = str(row["domain"]).lower()
+            entries.append((degree_name, degree_name, domain))
+
+    # Drop repeated phrases so each is searched for only once.
+    seen = set()
+    table = []
+    for phrase, degree, domain in entries + DEGREE_FALLBACKS:
+        if phrase not in seen:
+            seen.add(phrase)
+            table.append((phrase, degree, domain))
+    return table
+
+def get_degree_table():
+    global _degree_table
+
+    mtime = os.path.getmtime(DEGREE_DB_PATH)
+
+    if _degree_table is None or _degree_table[0] != mtime:
+        _degree_table = (mtime, load_degree_table())
+
+    return _degree_table[1]
+
+@traced("extract_degree_and_domain")
 def extract_degree_and_domain(text):
     if not os.path.exists(DEGREE_DB_PATH):
         return None, None
 
-    degrees_df = pd.read_csv(DEGREE_DB_PATH)
     text_clean = re.sub(r'\s+', ' ', text.lower())
 
-    for _, row in degrees_df.iterrows():
-        degree_name = str(row["degree"]).lower()
-        domain = str(row["domain"]).lower()
-        if degree_name in text_clean:
-            return degree_name, domain
-
-    if "b.tech" in text_clean or "btech" in text_clean:
-        return "bachelor of technology", "technology"
-
-    if "b.e" in text_clean:
-        return "bachelor of engineering", "technology"
+    # File order is priority order; each check is a C-level substring search.
+    for phrase, degree, domain in get_degree_table():
+        if phrase in text_clean:
+            return degree, domain
 
     return None, None
 
@@ -71,35 +221,94 @@ def load_tech_skills():
 def normalize_skill(skill):
     return skill.replace(".", "").replace("-", "").strip()
 
+_skill_matcher = None
+
+def build_skill_matcher(skill_data):
+    phrases = sorted(
+        {skill.lower() for skills in skill_data.values() for skill in skills},
+        key=len,
+        reverse=True
+    )
+
+    # One alternation, longest phrase first, inside a lookahead so the scan
+    # reports a match at every word boundary instead of consuming the text.
+    pattern = re.compile(
+        r"\b(?=(" + "|".join(re.escape(p) for p in phrases) + r")\b)"
+    )
+
+    # A scan reports only the longest phrase at each position; shorter
+    # phrases that are prefixes of it ("c" for "c++") are checked directly.
+    prefixes = {}
+    for phrase in phrases:
+        shorter = [
+            re.compile(re.escape(p) + r"\b")
+            for p in phrases
+            if len(p) < len(phrase) and phrase.startswith(p)
+        ]
+        if shorter:
+            prefixes[phrase] = shorter
+
+    return {
+        "skill_data": skill_data,
+        "pattern": pattern,
+        "prefixes": prefixes
+    }
+
+def get_skill_matcher():
+    global _skill_matcher
+
+    mtime = os.path.getmtime(TECH_SKILLS_PATH) if os.path.exists(TECH_SKILLS_PATH) else None
+
+    if _skill_matcher is None or _skill_matcher["mtime"] != mtime:
+        matcher = build_skill_matcher(load_tech_skills())
+        matcher["mtime"] = mtime
+        _skill_matcher = matcher
+
+    return _skill_matcher
+
+def find_skill_phrases(skills_text, matcher):
+    found = set()
+
+    for match in matcher["pattern"].finditer(skills_text):
+        phrase = match.group(1)
+        found.add(phrase)
+
+        for prefix in matcher["prefixes"].get(phrase, ()):
+            prefix_match = prefix.match(skills_text, match.start())
+            if prefix_match:
+                found.add(prefix_match.group(0))
+
+    return found
+
+@traced("extract_technical_skills")
 def extract_technical_skills(text):
-    skill_data = load_tech_skills()
+    matcher = get_skill_matcher()
     detected = {}
 
-    section_match = re.search(
-        r'skills(.*?)(projects|education|experience)',
-        text,
-        re.DOTALL
-    )
+    section_match = SKILLS_SECTION_PATTERN.search(text)
 
     if not section_match:
         return {}
 
     skills_text = section_match.group(1).lower()
+    found = find_skill_phrases(skills_text, matcher)
 
-    for category, skills in skill_data.items():
-        matched = []
-
-        for skill in skills:
-            pattern = r"\b" + re.escape(skill.lower()) + r"\b"
-
-            if re.search(pattern, skills_text):
-                matched.append(skill)
+    for category, skills in matcher["skill_data"].items():
+        matched = [skill for skill in skills if skill.lower() in found]
 
         if matched:
             detected[category] = matched
 
     return detected
 
+def parser_version():
+    """Changes whenever a data file or PDF limit that affects parse_resume output changes."""
+    return tuple(
+        os.path.getmtime(path) if os.path.exists(path) else None
+        for path in (TECH_SKILLS_PATH, DEGREE_DB_PATH)
+    ) + (MAX_PDF_PAGES, EARLY_EXIT, OCR_DPI)
+
+@traced("extract_experience_years")
 def extract_experience_years(text):
     patterns = [
         r'(\d+)\+?\s*years',
@@ -120,12 +329,11 @@ def extract_experience_years(text):
 
     return 0
 
+@traced("parse_resume")
 def parse_resume(file_path):
     text = extract_resume_text(file_path)
 
-    print("\n----- RAW TEXT PREVIEW -----\n")
-    print(text[:500])
-    print("\n----------------------------\n")
+    logger.debug("Extracted %d characters from %s", len(text), file_path)
 
     degree, domain = extract_degree_and_domain(text)
     technical_skills = extract_technical_skills(text)
@@ -1,14 +1,16 @@
+import os
 import json
 from sklearn.metrics.pairwise import cosine_similarity
-from models.embedding_model import get_embedding
+from ml.models.embedding_model import get_encoder, get_embedding
 
-with open("data/career_profiles.json") as f:
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+with open(os.path.join(BASE_DIR, "data", "career_profiles.json")) as f:
     CAREERS = json.load(f)
 
-career_embeddings = [
-    get_embedding(c["description"])
-    for c in CAREERS
-]
+career_embeddings = get_encoder().encode(
+    [c["description"] for c in CAREERS]
+)
 
 def recommend(resume_text, top_k=5):
 
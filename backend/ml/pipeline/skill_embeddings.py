@@ -0,0 +1,158 @@
+import os
+import json
+import pickle
+import threading
+import numpy as np
+from ml.pipeline.profile_index import EMBEDDING_FILE, get_profile_index
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES_FILE = os.path.join(BASE_DIR, "data", "career_profiles.json")
+SKILL_EMBEDDING_FILE = os.path.join(BASE_DIR, "models", "skill_embeddings.pkl")
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def source_signature():
+    signature = []
+    for path in (EMBEDDING_FILE, PROFILES_FILE):
+        if os.path.exists(path):
+            signature.append((os.path.basename(path), os.path.getmtime(path)))
+    return signature
+
+
+def collect_skills():
+    skills = []
+    seen = set()
+
+    sources = []
+    if os.path.exists(EMBEDDING_FILE):
+        sources.append(get_profile_index().profiles)
+    if os.path.exists(PROFILES_FILE):
+        with open(PROFILES_FILE, "r") as f:
+            sources.append(json.load(f))
+
+    for profiles in sources:
+        for profile in profiles:
+            for skill in profile.get("skills", []):
+                if skill not in seen:
+                    seen.add(skill)
+                    skills.append(skill)
+
+    return skills
+
+
+def normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms)
+
+
+def build_skill_store(model, model_name):
+    skills = collect_skills()
+    embeddings = model.encode(skills, batch_size=64) if skills else np.zeros((0, 0))
+
+    store = {
+        "model_name": model_name,
+        "source_signature": source_signature(),
+        "skills": skills,
+        "embeddings": normalize_rows(embeddings)
+    }
+
+    # Readers in other processes may load the file at any time, so it is
+    # written under a temporary name and renamed into place.
+    temp_path = f"{SKILL_EMBEDDING_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(store, f)
+    os.replace(temp_path, SKILL_EMBEDDING_FILE)
+
+    return store
+
+
+def is_current(store, model_name):
+    return (
+        store.get("model_name") == model_name and
+        store.get("source_signature") == source_signature()
+    )
+
+
+def get_skill_store(model, model_name):
+    global _store
+
+    store = _store
+    if store is not None and is_current(store, model_name):
+        return store
+
+    with _store_lock:
+        # Another thread may have loaded or rebuilt the store meanwhile.
+        if _store is not None and is_current(_store, model_name):
+            return _store
+
+        store = None
+        if os.path.exists(SKILL_EMBEDDING_FILE):
+            with open(SKILL_EMBEDDING_FILE, "rb") as f:
+                store = pickle.load(f)
+            if not is_current(store, model_name):
+                store = None
+
+        if store is None:
+            store = build_skill_store(model, model_name)
+
+        store["index"] = {skill: i for i, skill in enumerate(store["skills"])}
+        _store = store
+        return _store
+
+
+def add_missing_skills(store, model, skills):
+    """Return a store that covers skills, encoding the ones it lacks.
+
+    Stores are never modified in place: new skills go into a copy that
+    replaces the shared store in one assignment, so a concurrent reader
+    always sees skills, index and embeddings that match.
+    """
+    global _store
+
+    if all(skill in store["index"] for skill in skills):
+        return store
+
+    with _store_lock:
+        if _store is not None and _store.get("model_name") == store.get("model_name"):
+            # Pick up skills another thread added since store was fetched.
+            store = _store
+
+        missing = [s for s in dict.fromkeys(skills) if s not in store["index"]]
+        if not missing:
+            return store
+
+        vectors = normalize_rows(model.encode(missing))
+        offset = len(store["skills"])
+        index = dict(store["index"])
+        for i, skill in enumerate(missing):
+            index[skill] = offset + i
+
+        _store = {
+            **store,
+            "skills": store["skills"] + missing,
+            "embeddings": (
+                np.vstack([store["embeddings"], vectors])
+                if len(store["embeddings"]) else vectors
+            ),
+            "index": index
+        }
+        return _store
+
+
+def skill_similarities(resume_embedding, store):
+    resume_vector = np.asarray(resume_embedding, dtype=np.float32)
+    norm = np.linalg.norm(resume_vector)
+    if norm:
+        resume_vector = resume_vector / norm
+    return store["embeddings"] @ resume_vector
+
+
+if __name__ == "__main__":
+    from ml.models.embedding_model import encoder_id, get_encoder
+
+    store = build_skill_store(get_encoder(), encoder_id())
+    print("Skill embeddings built:", len(store["skills"]), "skills ->", SKILL_EMBEDDING_FILE)
@@ -1,57 +1,121 @@
+import os
 import json
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from ml.models.embedding_model import MODEL_NAME, encoder_id, get_encoder
+from ml.pipeline.vector_index import DEFAULT_BACKEND, create_index, load_index
 
-MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+INDEX_DIR = os.path.join(BASE_DIR, "models", "onet_title_index")
+
+# Titles encoded and searched per batch.
+QUERY_BATCH_SIZE = 1024
 
 def load_data():
-    with open("data/career_titles.json") as f:
+    with open(os.path.join(DATA_DIR, "career_titles.json")) as f:
         career_titles = json.load(f)
 
-    with open("data/onet_processed.json") as f:
+    with open(os.path.join(DATA_DIR, "onet_processed.json")) as f:
         onet_profiles = json.load(f)
 
     return career_titles, onet_profiles
 
 
-def map_titles():
+def get_onet_index(onet_profiles, model, backend=None, path=INDEX_DIR):
+    """Load the persisted O*NET title index and bring it in line with onet_profiles.
+
+    The index records the title it encoded for each O*NET code, so a new
+    O*NET release only costs an encode of new or retitled codes. Codes
+    that were dropped or retitled are rebuilt out of the index, reusing
+    the stored vectors of everything else. The index is rebuilt when the
+    model or backend changes.
+    """
+    backend = backend or DEFAULT_BACKEND
+    index = load_index(path)
+
+    if (
+        index is None or
+        index.backend != backend or
+        index.metadata.get("model_name") != encoder_id()
+    ):
+        index = None
+
+    titles = {profile["onet_code"]: profile["title"] for profile in onet_profiles}
+    indexed_titles = index.metadata.get("titles", {}) if index is not None else {}
+
+    current = [
+        code for code in (index.ids if index is not None else [])
+        if code in titles and indexed_titles.get(code) == titles[code]
+    ]
+    kept = set(current)
+    missing = [code for code in titles if code not in kept]
+    stale = index is not None and len(current) != len(index)
+
+    if not missing and not stale:
+        return index
+
+    metadata = {"model_name": encoder_id(), "titles": {code: titles[code] for code in current}}
+    kept_vectors = index.vectors_for(current) if index is not None else None
+
+    vectors = None
+    if missing:
+        print(f"Embedding {len(missing)} O*NET titles...")
+        vectors = model.encode([titles[code] for code in missing], show_progress_bar=True)
+
+    dim = vectors.shape[1] if vectors is not None else index.dim
+    rebuilt = create_index(dim, backend, metadata)
+    if current:
+        rebuilt.add(kept_vectors, current)
+    if missing:
+        rebuilt.add(vectors, missing)
+        rebuilt.metadata["titles"].update((code, titles[code]) for code in missing)
+    rebuilt.save(path)
+
+    return rebuilt
+
+
+def match_titles(titles, onet_profiles, index, model, batch_size=QUERY_BATCH_SIZE):
+    by_code = {profile["onet_code"]: profile for profile in onet_profiles}
+    results = []
+
+    for start in range(0, len(titles), batch_size):
+        batch = titles[start:start + batch_size]
+        scores, positions = index.search(model.encode(batch), k=1)
+
+        for title, score, position in zip(batch, scores[:, 0], positions[:, 0]):
+            best_match = by_code.get(index.ids[position])
+            if best_match is None:
+                # Only an index built for other profiles can return these.
+                continue
+            results.append({
+                "career_title": title,
+                "matched_onet_title": best_match["title"],
+                "similarity_score": float(score),
+                "onet_code": best_match["onet_code"]
+            })
+
+    return results
+
+
+def map_titles(titles=None, backend=None, output_file=None):
 
     career_titles, onet_profiles = load_data()
+    if titles is None:
+        titles = career_titles
 
-    model = SentenceTransformer(MODEL_NAME)
-
-    print("Embedding O*NET titles...")
-    onet_titles = [profile["title"] for profile in onet_profiles]
-    onet_embeddings = model.encode(onet_titles, show_progress_bar=True)
-
-    print("Embedding career titles...")
-    career_embeddings = model.encode(career_titles, show_progress_bar=True)
-
-    mapping_results = []
-
-    for i, career_title in enumerate(career_titles):
-
-        career_vector = career_embeddings[i].reshape(1, -1)
-
-        similarities = cosine_similarity(career_vector, onet_embeddings)[0]
-
-        best_index = np.argmax(similarities)
+    model = get_encoder(MODEL_NAME)
 
-        best_match = onet_profiles[best_index]
+    index = get_onet_index(onet_profiles, model, backend)
 
-        mapping_results.append({
-            "career_title": career_title,
-            "matched_onet_title": best_match["title"],
-            "similarity_score": float(similarities[best_index]),
-            "onet_code": best_match["onet_code"]
-        })
+    print(f"Mapping {len(titles)} titles...")
+    mapping_results = match_titles(titles, onet_profiles, index, model)
 
-    with open("data/title_mapping.json", "w") as f:
+    output_file = output_file or os.path.join(DATA_DIR, "title_mapping.json")
+    with open(output_file, "w") as f:
         json.dump(mapping_results, f, indent=2)
 
     print("Title mapping completed.")
+    return mapping_results
 
 
 if __name__ == "__main__":
-    map_titles()
\ No newline at end of file
+    map_titles()
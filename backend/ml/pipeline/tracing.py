@@ -0,0 +1,116 @@
+"""
+Lightweight per-stage timing for the analysis pipeline.
+
+Wrap a function with @traced("stage") or a block with `with stage("name")`.
+Every timing is added to a process-wide histogram (rendered in Prometheus
+text format by render_prometheus) and, inside collect_timings(), to a
+per-request breakdown. Timings are per process: stages that run in a
+worker pool (background jobs, parallel PDF pages) are recorded in that
+worker's registry.
+"""
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+METRIC_NAME = "resume_pipeline_stage_seconds"
+
+# Upper bounds in seconds, spanning regex passes to OCR of a full resume.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current = ContextVar("stage_timings", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def record(name, seconds):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    timings = _current.get()
+    if timings is not None:
+        total, calls = timings.get(name, (0.0, 0))
+        timings[name] = (total + seconds, calls + 1)
+
+
+@contextmanager
+def stage(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def traced(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect_timings():
+    """Collect {stage: (seconds, calls)} for everything traced inside the block."""
+    timings = {}
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def snapshot():
+    with _lock:
+        return {
+            name: (h.buckets, list(h.counts), h.sum, h.count)
+            for name, h in _histograms.items()
+        }
+
+
+def render_prometheus():
+    lines = [
+        f"# HELP {METRIC_NAME} Time spent in each resume analysis stage.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for name, (buckets, counts, total, count) in sorted(snapshot().items()):
+        cumulative = 0
+        for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{name}"}} {total:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{name}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
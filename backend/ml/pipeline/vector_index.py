@@ -0,0 +1,236 @@
+import os
+import abc
+import json
+import numpy as np
+
+# "exact" (NumPy, default) or "hnsw" (requires hnswlib).
+DEFAULT_BACKEND = os.environ.get("VECTOR_INDEX_BACKEND", "exact")
+
+META_FILE = "meta.json"
+
+
+def temp_name(path):
+    """A sibling of path to write to before os.replace()-ing it into place."""
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(vectors / norms)
+
+
+class VectorIndex(abc.ABC):
+    """Cosine-similarity index over vectors identified by string ids.
+
+    Subclasses store the vectors; this class keeps the id mapping and
+    the on-disk layout (a directory holding meta.json plus backend files).
+    Every file is written under a temporary name and renamed into place,
+    backend files before meta.json, so a concurrent load never sees more
+    ids than the vectors it reads.
+    """
+
+    backend = None
+
+    def __init__(self, dim, metadata=None):
+        self.dim = dim
+        self.ids = []
+        self.positions = {}
+        self.metadata = metadata or {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, item_id):
+        return item_id in self.positions
+
+    def add(self, vectors, ids):
+        """Add vectors for ids not already indexed; returns how many were added."""
+        vectors = normalize(vectors) if len(ids) else np.zeros((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        keep = []
+        for row, item_id in enumerate(ids):
+            if item_id not in self.positions:
+                self.positions[item_id] = len(self.ids)
+                self.ids.append(item_id)
+                keep.append(row)
+
+        if keep:
+            self._add(vectors[keep], len(self.ids) - len(keep))
+        return len(keep)
+
+    def vectors_for(self, ids):
+        """Return the stored (normalized) vectors for ids, in order."""
+        positions = np.array([self.positions[item_id] for item_id in ids], dtype=np.int64)
+        if not len(positions):
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self._get(positions)
+
+    def search(self, queries, k=1):
+        """Return (scores, positions) arrays of shape (len(queries), k), best first."""
+        queries = normalize(queries)
+        k = min(k, len(self))
+        if not k:
+            empty = np.zeros((len(queries), 0))
+            return empty.astype(np.float32), empty.astype(np.int64)
+        return self._search(queries, k)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        self._save(path)
+        meta = {
+            "backend": self.backend,
+            "dim": self.dim,
+            "ids": self.ids,
+            "metadata": self.metadata
+        }
+        meta_path = os.path.join(path, META_FILE)
+        with open(temp_name(meta_path), "w") as f:
+            json.dump(meta, f)
+        os.replace(temp_name(meta_path), meta_path)
+
+    @classmethod
+    def _restore(cls, path, meta):
+        index = cls(meta["dim"], meta["metadata"])
+        index.ids = meta["ids"]
+        index.positions = {item_id: i for i, item_id in enumerate(index.ids)}
+        index._load(path)
+        return index
+
+    @abc.abstractmethod
+    def _add(self, vectors, offset):
+        """Store normalized vectors at positions offset, offset + 1, ..."""
+
+    @abc.abstractmethod
+    def _get(self, positions):
+        """Return the stored vectors at positions."""
+
+    @abc.abstractmethod
+    def _search(self, queries, k):
+        """Return (scores, positions) for normalized queries, best first."""
+
+    @abc.abstractmethod
+    def _save(self, path):
+        """Write the backend files into path, each via temp_name and os.replace."""
+
+    @abc.abstractmethod
+    def _load(self, path):
+        """Read the backend files written by _save."""
+
+
+class ExactIndex(VectorIndex):
+    """Brute-force search with one matrix product per query batch."""
+
+    backend = "exact"
+    vectors_file = "vectors.npy"
+
+    def __init__(self, dim, metadata=None):
+        super().__init__(dim, metadata)
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def _add(self, vectors, offset):
+        self.vectors = np.vstack([self.vectors, vectors])
+
+    def _get(self, positions):
+        return self.vectors[positions]
+
+    def _search(self, queries, k):
+        scores = queries @ self.vectors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        return (
+            np.take_along_axis(top_scores, order, axis=1),
+            np.take_along_axis(top, order, axis=1)
+        )
+
+    def _save(self, path):
+        vectors_path = os.path.join(path, self.vectors_file)
+        # A file object, so np.save does not append .npy to the temporary name.
+        with open(temp_name(vectors_path), "wb") as f:
+            np.save(f, self.vectors)
+        os.replace(temp_name(vectors_path), vectors_path)
+
+    def _load(self, path):
+        self.vectors = np.load(os.path.join(path, self.vectors_file))
+
+
+class HNSWIndex(VectorIndex):
+    """Approximate search backed by hnswlib."""
+
+    backend = "hnsw"
+    index_file = "hnsw.bin"
+
+    M = 16
+    EF_CONSTRUCTION = 200
+    EF_SEARCH = int(os.environ.get("VECTOR_INDEX_EF_SEARCH", "64"))
+
+    def __init__(self, dim, metadata=None):
+        super().__init__(dim, metadata)
+        import hnswlib
+
+        # Initialized on the first add, or replaced wholesale by _load.
+        self.index = hnswlib.Index(space="ip", dim=dim)
+        self.initialized = False
+
+    def _add(self, vectors, offset):
+        needed = offset + len(vectors)
+        if not self.initialized:
+            self.index.init_index(
+                max_elements=max(needed, 1024),
+                ef_construction=self.EF_CONSTRUCTION,
+                M=self.M
+            )
+            self.initialized = True
+        elif needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+        self.index.add_items(vectors, np.arange(offset, needed))
+
+    def _get(self, positions):
+        return np.asarray(self.index.get_items(positions), dtype=np.float32)
+
+    def _search(self, queries, k):
+        self.index.set_ef(max(self.EF_SEARCH, k))
+        labels, distances = self.index.knn_query(queries, k=k)
+        # hnswlib's "ip" space reports 1 - inner product.
+        return (1.0 - distances).astype(np.float32), labels.astype(np.int64)
+
+    def _save(self, path):
+        index_path = os.path.join(path, self.index_file)
+        self.index.save_index(temp_name(index_path))
+        os.replace(temp_name(index_path), index_path)
+
+    def _load(self, path):
+        self.index.load_index(
+            os.path.join(path, self.index_file),
+            max_elements=max(len(self.ids), 1)
+        )
+        self.initialized = True
+
+
+BACKENDS = {
+    ExactIndex.backend: ExactIndex,
+    HNSWIndex.backend: HNSWIndex,
+}
+
+
+def create_index(dim, backend=None, metadata=None):
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vector index backend: {backend}")
+    return BACKENDS[backend](dim, metadata)
+
+
+def load_index(path):
+    """Load an index saved with VectorIndex.save, or return None if there is none."""
+    meta_path = os.path.join(path, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+
+    return BACKENDS[meta["backend"]]._restore(path, meta)
@@ -0,0 +1,374 @@
+import os
+import pickle
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+import numpy as np
+
+from ml.models.embedding_cache import EmbeddingCache
+from ml.models.embedding_service import EmbeddingService, render_prometheus
+from ml.pipeline import adzuna_fetcher
+from ml.pipeline.market_cache import MarketCache
+from ml.pipeline.profile_index import ProfileIndex
+from ml.pipeline.recommendation_engine import get_dynamic_weights, rank_careers, select_top
+from ml.pipeline.vector_index import META_FILE, ExactIndex, VectorIndex, create_index, load_index
+
+
+class DictBackend:
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+
+    def get_many(self, titles):
+        return {title: self.entries[title] for title in titles if title in self.entries}
+
+    def set_many(self, entries):
+        self.entries.update(entries)
+
+
+def market(job_count):
+    return {'job_count': job_count, 'average_salary': 0, 'market_score': 0}
+
+
+class MarketCacheTests(TestCase):
+    def setUp(self):
+        now = time.time()
+        self.backend = DictBackend({
+            'fresh': (market(1), now - 10),
+            'stale': (market(2), now - 150),
+            'expired': (market(3), now - 500),
+        })
+        self.cache = MarketCache(self.backend, ttl=100, stale_ttl=200)
+
+    def test_lookup_classifies_by_age(self):
+        values, stale, expired = self.cache.lookup(['fresh', 'stale', 'expired', 'unknown'])
+
+        self.assertEqual(values, {'fresh': market(1), 'stale': market(2)})
+        self.assertEqual(stale, ['stale'])
+        self.assertEqual(expired, {'expired': market(3)})
+
+    def test_store_makes_entries_fresh(self):
+        self.cache.store({'expired': market(4)})
+
+        values, stale, expired = self.cache.lookup(['expired'])
+        self.assertEqual(values, {'expired': market(4)})
+        self.assertEqual((stale, expired), ([], {}))
+        self.assertEqual(self.backend.entries['expired'][0], market(4))
+
+    def test_batch_serves_expired_values_without_waiting(self):
+        fetch = mock.Mock(return_value={})
+        with mock.patch.object(adzuna_fetcher, 'get_market_cache', return_value=self.cache), \
+                mock.patch.object(self.cache, 'revalidate') as revalidate, \
+                mock.patch.object(adzuna_fetcher, 'fetch_titles', fetch):
+            result = adzuna_fetcher.fetch_market_data_batch(['stale', 'expired'])
+
+        self.assertEqual(result, {'stale': market(2), 'expired': market(3)})
+        fetch.assert_not_called()
+        self.assertEqual(sorted(revalidate.call_args[0][0]), ['expired', 'stale'])
+
+    def test_batch_fetches_misses_unless_told_not_to_wait(self):
+        fetch = mock.Mock(return_value={'unknown': market(5)})
+        with mock.patch.object(adzuna_fetcher, 'get_market_cache', return_value=self.cache), \
+                mock.patch.object(self.cache, 'revalidate') as revalidate, \
+                mock.patch.object(adzuna_fetcher, 'fetch_titles', fetch):
+            self.assertEqual(
+                adzuna_fetcher.fetch_market_data_batch(['unknown'], wait=False),
+                {'unknown': adzuna_fetcher.default_response()}
+            )
+            fetch.assert_not_called()
+            revalidate.assert_called_once_with(['unknown'], fetch)
+
+            self.assertEqual(adzuna_fetcher.fetch_market_data_batch(['unknown']), {'unknown': market(5)})
+            fetch.assert_called_once_with(['unknown'], adzuna_fetcher.MAX_WORKERS)
+
+
+class SelectTopTests(TestCase):
+    def test_orders_by_score_then_tiebreak_then_position(self):
+        scores = np.array([50.0, 70.0, 50.0, 90.0, 50.0])
+        tiebreak = np.array([1.0, 0.0, 3.0, 0.0, 3.0])
+
+        self.assertEqual(select_top(scores, tiebreak, min_score=20).tolist(), [3, 1, 2, 4, 0])
+
+    def test_min_score_is_exclusive(self):
+        scores = np.array([20.0, 20.01, 5.0])
+        self.assertEqual(select_top(scores, np.zeros(3), min_score=20).tolist(), [1])
+
+    def test_top_k_keeps_ties_for_the_tiebreak(self):
+        scores = np.array([60.0, 80.0, 60.0, 60.0])
+        tiebreak = np.array([0.0, 0.0, 2.0, 1.0])
+
+        self.assertEqual(select_top(scores, tiebreak, top_k=2).tolist(), [1, 2])
+        self.assertEqual(select_top(scores, tiebreak, top_k=3).tolist(), [1, 2, 3])
+        self.assertEqual(select_top(scores, tiebreak, top_k=10).tolist(), [1, 2, 3, 0])
+        self.assertEqual(select_top(scores, tiebreak, top_k=0).tolist(), [])
+
+
+class RankCareersTests(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        count = 200
+        self.profiles = [
+            {'career_title': f'Career {i}', 'skills': [f'skill {i % 7}']} for i in range(count)
+        ]
+        self.similarities = rng.uniform(0, 1, count)
+        market_score = np.round(rng.uniform(0, 100, count), 2)
+        self.market = SimpleNamespace(
+            market_score=market_score,
+            entries=[
+                {'market_score': float(score), 'job_count': 1, 'average_salary': 0}
+                for score in market_score
+            ]
+        )
+        skill_index = {f'skill {i}': i for i in range(7)}
+        self.skill_scores = (skill_index, np.linspace(0, 1, 7))
+        index = ProfileIndex(self.profiles, np.zeros((count, 1), dtype=np.float32))
+        patcher = mock.patch('ml.pipeline.recommendation_engine.get_profile_index', return_value=index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def rank(self, experience, **kwargs):
+        return rank_careers(
+            {'experience_years': experience},
+            np.zeros(1),
+            similarities=self.similarities,
+            skill_scores=self.skill_scores,
+            market=self.market,
+            **kwargs
+        )
+
+    def loop_ranking(self, experience):
+        """Titles in the order the original per-profile loop produced."""
+        semantic_weight, market_weight = get_dynamic_weights(experience)
+        results = []
+        for idx in np.argsort(self.similarities)[::-1]:
+            final_score = (
+                float(self.similarities[idx]) * 100 * semantic_weight +
+                self.market.entries[idx]['market_score'] * market_weight
+            )
+            results.append((self.profiles[idx]['career_title'], round(final_score, 2)))
+        results = sorted(results, key=lambda r: r[1], reverse=True)
+        return [title for title, score in results if score > 20]
+
+    def test_matches_the_original_loop(self):
+        for experience in (1, 5, 10):
+            titles = [r['career_title'] for r in self.rank(experience)]
+            self.assertEqual(titles, self.loop_ranking(experience))
+
+    def test_top_k_is_a_prefix_of_the_full_ranking(self):
+        full = [r['career_title'] for r in self.rank(5)]
+        self.assertEqual([r['career_title'] for r in self.rank(5, top_k=10)], full[:10])
+
+
+class ExactIndexTests(TestCase):
+    def setUp(self):
+        self.vectors = np.array([[1, 0, 0], [0, 2, 0], [0, 0, 3], [1, 1, 0]], dtype=np.float32)
+        self.index = ExactIndex(3, metadata={'model': 'test'})
+        self.index.add(self.vectors, ['a', 'b', 'c', 'd'])
+
+    def test_add_skips_known_ids(self):
+        added = self.index.add(np.array([[5, 5, 5], [0, 0, 1]]), ['a', 'e'])
+
+        self.assertEqual(added, 1)
+        self.assertEqual(self.index.ids, ['a', 'b', 'c', 'd', 'e'])
+        np.testing.assert_allclose(self.index.vectors_for(['a', 'e']), [[1, 0, 0], [0, 0, 1]])
+
+    def test_search_returns_best_matches_first(self):
+        scores, positions = self.index.search([[1, 0.9, 0]], k=2)
+
+        self.assertEqual(positions.tolist(), [[3, 0]])
+        self.assertGreater(scores[0, 0], scores[0, 1])
+        self.assertEqual(self.index.search([[1, 0, 0]], k=10)[1].shape, (1, 4))
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as path:
+            self.index.save(path)
+            self.assertEqual(sorted(os.listdir(path)), sorted([ExactIndex.vectors_file, META_FILE]))
+
+            loaded = load_index(path)
+            self.assertIsInstance(loaded, ExactIndex)
+            self.assertEqual(loaded.ids, self.index.ids)
+            self.assertEqual(loaded.metadata, {'model': 'test'})
+            np.testing.assert_allclose(loaded.vectors_for(['c', 'b']), [[0, 0, 1], [0, 1, 0]])
+
+    def test_load_missing_index(self):
+        with tempfile.TemporaryDirectory() as path:
+            self.assertIsNone(load_index(path))
+
+    def test_backends_must_implement_storage(self):
+        with self.assertRaises(TypeError):
+            VectorIndex(3)
+        with self.assertRaises(ValueError):
+            create_index(3, backend='annoy')
+
+
+class FakeEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1 / 3, 0.1] for text in texts], dtype=np.float32)
+
+
+class EmbeddingCacheTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'embeddings.sqlite3')
+        self.encoder = FakeEncoder()
+
+    def cache(self, model_name='model', **kwargs):
+        return EmbeddingCache(model_name, path=self.path, **kwargs)
+
+    def test_tiers(self):
+        cache = self.cache()
+        first = cache.encode(self.encoder, ['python', 'sql', 'python'])
+        self.assertEqual(self.encoder.calls, [['python', 'sql']])
+        np.testing.assert_array_equal(first[0], first[2])
+
+        # Whitespace differences share an entry; served from memory.
+        cache.encode(self.encoder, ['  python ', 'sql'])
+        self.assertEqual(cache.stats()['memory_hits'], 2)
+
+        # A new process only has the on-disk tier.
+        other = self.cache()
+        np.testing.assert_array_equal(other.encode(self.encoder, ['python', 'sql']), first[:2])
+        self.assertEqual(len(self.encoder.calls), 1)
+        self.assertEqual(other.stats()['disk_hits'], 2)
+
+    def test_models_do_not_share_entries(self):
+        self.cache('a').encode(self.encoder, ['python'])
+        self.cache('b').encode(self.encoder, ['python'])
+        self.assertEqual(len(self.encoder.calls), 2)
+
+    def test_lru_size_bounds_memory(self):
+        cache = self.cache(lru_size=2)
+        cache.encode(self.encoder, ['a', 'b', 'c'])
+        self.assertEqual(cache.stats()['lru_entries'], 2)
+
+    def test_float16_round_trip_is_consistent(self):
+        cache = self.cache(dtype=np.dtype('float16'))
+        encoded = cache.encode(self.encoder, ['python'])
+        from_memory = cache.encode(self.encoder, ['python'])
+        from_disk = self.cache(dtype=np.dtype('float16')).encode(self.encoder, ['python'])
+
+        self.assertEqual(encoded.dtype, np.float32)
+        np.testing.assert_array_equal(encoded, from_memory)
+        np.testing.assert_array_equal(encoded, from_disk)
+        np.testing.assert_allclose(encoded[0], [6, 1 / 3, 0.1], rtol=1e-3)
+        self.assertEqual(len(self.encoder.calls), 1)
+
+
+class EmbeddingServiceTests(TestCase):
+    def setUp(self):
+        self.batches = []
+
+    def encode(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[float(text[1:])] for text in texts], dtype=np.float32)
+
+    def encode_concurrently(self, service, requests):
+        results = [None] * len(requests)
+        errors = [None] * len(requests)
+
+        def call(i):
+            try:
+                results[i] = service.encode(requests[i])
+            except Exception as e:
+                errors[i] = e
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(requests))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_concurrent_requests_share_a_batch(self):
+        service = EmbeddingService(self.encode, max_batch_size=64, max_wait_ms=500)
+        requests = [[f't{i}', f't{i + 100}'] for i in range(5)]
+
+        results, errors = self.encode_concurrently(service, requests)
+
+        self.assertEqual(errors, [None] * 5)
+        for request, result in zip(requests, results):
+            self.assertEqual(result[:, 0].tolist(), [float(text[1:]) for text in request])
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(sorted(self.batches[0]), sorted(t for r in requests for t in r))
+
+        stats = service.stats()
+        self.assertEqual((stats['requests'], stats['texts'], stats['batches']), (5, 10, 1))
+
+    def test_batches_respect_max_batch_size(self):
+        service = EmbeddingService(self.encode, max_batch_size=4, max_wait_ms=200)
+        requests = [[f't{i}', f't{i + 100}', f't{i + 200}'] for i in range(3)]
+
+        results, errors = self.encode_concurrently(service, requests)
+
+        self.assertEqual(errors, [None] * 3)
+        self.assertEqual([len(batch) for batch in self.batches], [3, 3, 3])
+
+    def test_encode_error_reaches_every_caller_in_the_batch(self):
+        def fail(texts):
+            self.batches.append(list(texts))
+            raise RuntimeError('model crashed')
+
+        service = EmbeddingService(fail, max_batch_size=64, max_wait_ms=500)
+        results, errors = self.encode_concurrently(service, [['t1'], ['t2'], ['t3']])
+
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual([str(e) for e in errors], ['model crashed'] * 3)
+
+        # The thread survives and serves later requests.
+        service._encode = self.encode
+        self.assertEqual(service.encode(['t7'])[:, 0].tolist(), [7.0])
+
+    def test_caller_times_out(self):
+        release = threading.Event()
+
+        def slow(texts):
+            release.wait(5)
+            return self.encode(texts)
+
+        service = EmbeddingService(slow, max_wait_ms=0, result_timeout=0.05)
+        with self.assertRaises(TimeoutError):
+            service.encode(['t1'])
+        release.set()
+
+    def test_render_prometheus(self):
+        service = EmbeddingService(self.encode, max_wait_ms=0)
+        service.encode(['t1', 't2', 't3'])
+
+        text = render_prometheus({'model': service})
+        self.assertIn('encoder_queue_depth{encoder="model"} 0', text)
+        self.assertIn('encoder_batch_size_bucket{encoder="model",le="2"} 0', text)
+        self.assertIn('encoder_batch_size_bucket{encoder="model",le="4"} 1', text)
+        self.assertIn('encoder_batch_size_bucket{encoder="model",le="+Inf"} 1', text)
+        self.assertIn('encoder_batch_size_sum{encoder="model"} 3', text)
+        self.assertEqual(render_prometheus({}), '')
+
+
+class ProfileIndexMmapTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'profiles.pkl')
+
+    def write(self, embeddings, mtime):
+        with open(self.path, 'wb') as f:
+            pickle.dump({'profiles': [{'career_title': 'A'}, {'career_title': 'B'}], 'embeddings': embeddings}, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def load(self):
+        return ProfileIndex.load(self.path, mmap=True).embeddings
+
+    def test_matrix_follows_the_pickle(self):
+        self.write([[1.0, 0.0], [0.0, 1.0]], mtime=2_000_000)
+        self.assertIsInstance(self.load(), np.memmap)
+        np.testing.assert_allclose(self.load(), [[1, 0], [0, 1]])
+
+        # An older pickle restored in place (e.g. cp -p) must still win.
+        self.write([[0.0, 2.0], [3.0, 0.0]], mtime=1_000_000)
+        np.testing.assert_allclose(self.load(), [[0, 1], [1, 0]])